@@ -13,8 +13,13 @@ Uso:
 """
 
 import os
-import sys
+import json
+import time
+import argparse
+import threading
 import requests
+from requests.adapters import HTTPAdapter
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from dotenv import load_dotenv
 
@@ -24,19 +29,49 @@ load_dotenv(BASE_DIR / ".env")
 NOTION_TOKEN = os.getenv("NOTION_TOKEN")
 DB_ID        = os.getenv("NOTION_DB_ID")
 
-if not NOTION_TOKEN or not DB_ID:
-    raise SystemExit("Faltan variables de entorno: NOTION_TOKEN y/o NOTION_DB_ID")
-
 HEADERS = {
-    "Authorization":  f"Bearer {NOTION_TOKEN}",
     "Notion-Version": "2022-06-28",
     "Content-Type":   "application/json",
 }
 
-DRY_RUN = "--dry-run" in sys.argv
-
-if DRY_RUN:
-    print("⚠  Modo DRY-RUN: no se aplicarán cambios.\n")
+ARCHIVE_WORKERS = 3   # PATCH concurrentes contra Notion
+ARCHIVE_RPS     = 3   # Límite medio documentado por Notion (req/s)
+
+# Una sola sesión: reutiliza la conexión TLS con api.notion.com (keep-alive).
+# Un único host, con un socket persistente por hilo de archivado.
+SESSION = requests.Session()
+SESSION.headers.update(HEADERS)
+SESSION.mount("https://", HTTPAdapter(pool_connections=1, pool_maxsize=ARCHIVE_WORKERS))
+
+RETRY_STATUS = {429, 502, 503, 504}
+
+
+def require_env():
+    """
+    Valida las credenciales solo cuando se va a hablar con Notion, de modo
+    que importar el módulo o pedir --help no exige un .env configurado.
+    """
+    if not NOTION_TOKEN or not DB_ID:
+        raise SystemExit("Faltan variables de entorno: NOTION_TOKEN y/o NOTION_DB_ID")
+    SESSION.headers["Authorization"] = f"Bearer {NOTION_TOKEN}"
+
+
+def request_with_retry(method: str, url: str, max_tries: int = 6, **kw) -> requests.Response:
+    """
+    SESSION.request con reintentos ante 429/5xx transitorios.
+    Respeta Retry-After si Notion lo envía; si no, backoff exponencial.
+    """
+    for attempt in range(max_tries):
+        resp = SESSION.request(method, url, **kw)
+        if resp.status_code not in RETRY_STATUS or attempt == max_tries - 1:
+            return resp
+        # Retry-After puede venir en segundos o como fecha HTTP: solo se usa
+        # si es numérico; si no, backoff exponencial
+        retry_after = resp.headers.get("Retry-After", "")
+        wait = float(retry_after) if retry_after.isdigit() else float(2 ** attempt)
+        print(f"  ⏳ HTTP {resp.status_code}, reintentando en {wait:.0f}s...")
+        time.sleep(wait)
+    return resp
 
 
 def get_delete_pages() -> list:
@@ -53,11 +88,13 @@ def get_delete_pages() -> list:
         }
         if cursor:
             body["start_cursor"] = cursor
-        r = requests.post(
+        resp = request_with_retry(
+            "POST",
             f"https://api.notion.com/v1/databases/{DB_ID}/query",
-            headers=HEADERS,
             json=body,
-        ).json()
+            timeout=30,
+        )
+        r = json.loads(resp.content)
         pages.extend(r.get("results", []))
         if not r.get("has_more"):
             break
@@ -65,16 +102,52 @@ def get_delete_pages() -> list:
     return pages
 
 
+_rate_lock = threading.Lock()
+_next_slot = 0.0
+
+def throttle():
+    """Espacia las peticiones entre hilos para no superar ARCHIVE_RPS."""
+    global _next_slot
+    with _rate_lock:
+        now  = time.monotonic()
+        wait = _next_slot - now
+        _next_slot = max(now, _next_slot) + 1 / ARCHIVE_RPS
+    if wait > 0:
+        time.sleep(wait)
+
+
 def archive_page(page_id: str):
-    r = requests.patch(
+    throttle()
+    r = request_with_retry(
+        "PATCH",
         f"https://api.notion.com/v1/pages/{page_id}",
-        headers=HEADERS,
         json={"archived": True},
+        timeout=30,
     )
     r.raise_for_status()
 
 
+def page_title(page: dict) -> str:
+    title_parts = page["properties"].get("Name", {}).get("title", [])
+    return title_parts[0]["plain_text"] if title_parts else "(sin título)"
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Archiva los registros de GenAI Radar con Status = Delete."
+    )
+    parser.add_argument("--dry-run", action="store_true",
+                        help="muestra qué borraría sin aplicar cambios")
+    return parser.parse_args()
+
+
 def main():
+    args = parse_args()
+    require_env()
+
+    if args.dry_run:
+        print("⚠  Modo DRY-RUN: no se aplicarán cambios.\n")
+
     print("Buscando entradas marcadas como Delete...")
     pages = get_delete_pages()
 
@@ -84,27 +157,33 @@ def main():
 
     print(f"Encontradas: {len(pages)} entradas\n")
 
+    if args.dry_run:
+        for page in pages:
+            print(f"  [DRY] Archivaría: {page_title(page)[:80]}")
+        return
+
     deleted = 0
     errors  = 0
 
-    for page in pages:
-        page_id     = page["id"]
-        title_parts = page["properties"].get("Name", {}).get("title", [])
-        title       = title_parts[0]["plain_text"] if title_parts else "(sin título)"
-
-        if DRY_RUN:
-            print(f"  [DRY] Archivaría: {title[:80]}")
-        else:
-            try:
-                archive_page(page_id)
+    def archive_one(page: dict):
+        try:
+            archive_page(page["id"])
+            return page_title(page), None
+        except Exception as e:
+            return page_title(page), e
+
+    # Los PATCH son independientes: se lanzan en paralelo (acotado por
+    # ARCHIVE_WORKERS y ARCHIVE_RPS) y se informan en el orden original.
+    with ThreadPoolExecutor(max_workers=ARCHIVE_WORKERS) as pool:
+        for title, error in pool.map(archive_one, pages):
+            if error is None:
                 deleted += 1
                 print(f"  🗑  Archivado: {title[:80]}")
-            except Exception as e:
+            else:
                 errors += 1
-                print(f"  ❌ Error en '{title[:80]}': {e}")
+                print(f"  ❌ Error en '{title[:80]}': {error}")
 
-    if not DRY_RUN:
-        print(f"""
+    print(f"""
 --- Resumen cleanup ---
 Archivados: {deleted}
 Errores:    {errors}
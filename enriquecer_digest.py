@@ -64,29 +64,32 @@ enable_ansi_windows()
 # ----------------------------
 BLOCK_SEP = re.compile(r"^\s*#\s*\d+\)", re.MULTILINE)
 
-def parse_blocks(text: str) -> list:
-    positions = [m.start() for m in BLOCK_SEP.finditer(text)]
-    if not positions:
-        return []
-    blocks = []
-    for i, start in enumerate(positions):
-        end = positions[i + 1] if i + 1 < len(positions) else len(text)
-        block = text[start:end].strip()
-        if block:
-            blocks.append(block)
-    return blocks
+def iter_blocks(text: str):
+    """Genera los bloques '# N) ...' de uno en uno, a medida que se revisan."""
+    start = None
+    for m in BLOCK_SEP.finditer(text):
+        if start is not None:
+            yield text[start:m.start()].strip()
+        start = m.start()
+    if start is not None:
+        yield text[start:].strip()
+
+def count_blocks(text: str) -> int:
+    return len(BLOCK_SEP.findall(text))
 
 def extract_title(block: str) -> str:
     first_line = block.split("\n")[0]
     return re.sub(r"^#\s*\d+\)\s*", "", first_line).strip()
 
-def extract_field(block: str, field: str) -> str:
-    pattern = re.compile(
-        rf"^{re.escape(field)}:\s*(.+?)(?=\n[A-ZÁÉÍÓÚÑa-z\w ]+:|$)",
-        re.MULTILINE | re.DOTALL
-    )
-    m = pattern.search(block)
-    return m.group(1).strip() if m else ""
+# "Etiqueta: valor", una por línea. Compilada una vez; parse_fields la
+# aplica en una sola pasada por bloque en lugar de un regex por campo.
+FIELD_RE = re.compile(r"^([^\n:#]+):[ \t]*(.*)$", re.MULTILINE)
+
+def parse_fields(block: str) -> dict:
+    fields = {}
+    for label, value in FIELD_RE.findall(block):
+        fields.setdefault(label.strip(), value.strip())
+    return fields
 
 def renumber_blocks(blocks: list, offset: int = 0) -> list:
     renumbered = []
@@ -125,11 +128,12 @@ SEP = C.GRAY + "─" * 68 + C.RESET
 
 def print_block(block: str, index: int, total: int):
     title   = extract_title(block)
-    url     = extract_field(block, "URL")
-    que_es  = extract_field(block, "Qué es")
-    sirve   = extract_field(block, "Para qué sirve")
-    req     = extract_field(block, "Requisitos")
-    cambios = extract_field(block, "Cambios importantes")
+    fields  = parse_fields(block)
+    url     = fields.get("URL", "")
+    que_es  = fields.get("Qué es", "")
+    sirve   = fields.get("Para qué sirve", "")
+    req     = fields.get("Requisitos", "")
+    cambios = fields.get("Cambios importantes", "")
 
     def trunc(s, n=110):
         return s[:n] + "..." if len(s) > n else s
@@ -181,21 +185,19 @@ def main():
         sys.exit(1)
 
     raw_text = RAW_FILE.read_text(encoding="utf-8")
-    blocks = parse_blocks(raw_text)
+    total = count_blocks(raw_text)
 
-    if not blocks:
+    if not total:
         print(f"{C.YELLOW}digest_raw.txt está vacío o sin entradas válidas.{C.RESET}")
         sys.exit(0)
 
-    total = len(blocks)
     print(f"  {C.WHITE}{total} entradas encontradas{C.RESET}")
 
     # ¿Añadir o sobreescribir digest.txt existente?
     mode = "w"
     existing_count = 0
     if IMPORT_FILE.exists():
-        existing_blocks = parse_blocks(IMPORT_FILE.read_text(encoding="utf-8"))
-        existing_count = len(existing_blocks)
+        existing_count = count_blocks(IMPORT_FILE.read_text(encoding="utf-8"))
         if existing_count:
             print(f"\n  {C.YELLOW}digest.txt ya contiene {existing_count} entradas.{C.RESET}")
             print(f"  {C.GREEN}[A]{C.RESET} Añadir al final   {C.RED}[S]{C.RESET} Sobreescribir   {C.GRAY}[C]{C.RESET} Cancelar")
@@ -216,7 +218,7 @@ def main():
     accepted_blocks = []
     stats = {"accepted": 0, "edited": 0, "discarded": 0}
 
-    for i, block in enumerate(blocks, 1):
+    for i, block in enumerate(iter_blocks(raw_text), 1):
         print_block(block, i, total)
         print_prompt()
 
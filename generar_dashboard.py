@@ -7,17 +7,24 @@ un archivo dashboard.html local con gráficas y estadísticas.
 No requiere Notion Plus ni configurar vistas manualmente.
 Abre dashboard.html en el navegador para ver el resultado.
 
+Flags opcionales:
+  --refresh  Ignora la caché local y vuelve a descargar de Notion
+
 Requiere en .env:
   NOTION_TOKEN=...
   NOTION_DB_ID=...
 """
 
 import os
+import sys
+import json
+import time
 import webbrowser
 import requests
+from requests.adapters import HTTPAdapter
 from pathlib import Path
 from datetime import datetime, timezone
-from collections import defaultdict
+from collections import Counter
 
 from dotenv import load_dotenv
 
@@ -40,66 +47,149 @@ NOTION_HEADERS = {
 }
 OUTPUT = BASE_DIR / "dashboard.html"
 
+CACHE_FILE = BASE_DIR / "state" / "dashboard_records.json"
+CACHE_TTL  = 15 * 60   # segundos; re-ejecuciones dentro de la ventana no tocan Notion
+REFRESH    = "--refresh" in sys.argv
+TOP_K      = 12        # barras máximas por gráfica
+
+# Una sola sesión: reutiliza la conexión TLS con api.notion.com (keep-alive)
+SESSION = requests.Session()
+SESSION.headers.update(NOTION_HEADERS)
+SESSION.mount("https://", HTTPAdapter(pool_connections=10, pool_maxsize=10))
+
+RETRY_STATUS = {429, 502, 503, 504}
+
+# Propiedades que lee extract(); el resto no se descarga
+DASHBOARD_PROPS = {"Name", "Category", "Ecosystem", "Source", "Status", "Priority", "Signal", "Date"}
+
 
 # ----------------------------
 # Lectura de Notion (requests directo, sin SDK)
 # ----------------------------
-def fetch_all_pages() -> list[dict]:
-    """Descarga todos los registros de la base de datos vía API REST."""
-    pages  = []
-    cursor = None
-    url    = f"https://api.notion.com/v1/databases/{DB_ID}/query"
+def request_with_retry(method: str, url: str, max_tries: int = 6, **kw) -> requests.Response:
+    """
+    SESSION.request con reintentos ante 429/5xx transitorios.
+    Respeta Retry-After si Notion lo envía; si no, backoff exponencial.
+    """
+    for attempt in range(max_tries):
+        resp = SESSION.request(method, url, **kw)
+        if resp.status_code not in RETRY_STATUS or attempt == max_tries - 1:
+            return resp
+        # Retry-After puede venir en segundos o como fecha HTTP: solo se usa
+        # si es numérico; si no, backoff exponencial
+        retry_after = resp.headers.get("Retry-After", "")
+        wait = float(retry_after) if retry_after.isdigit() else float(2 ** attempt)
+        print(f"  ⏳ HTTP {resp.status_code}, reintentando en {wait:.0f}s...")
+        time.sleep(wait)
+    return resp
+
+
+def fetch_property_ids() -> list[str]:
+    """IDs de DASHBOARD_PROPS en el schema de la base de datos."""
+    resp = request_with_retry("GET", f"https://api.notion.com/v1/databases/{DB_ID}", timeout=30)
+    if resp.status_code != 200:
+        raise SystemExit(f"Error Notion API: {resp.status_code} — {resp.text[:300]}")
+    props = json.loads(resp.content).get("properties", {})
+    return [p["id"] for name, p in props.items() if name in DASHBOARD_PROPS]
+
+
+def fetch_records() -> list[dict]:
+    """
+    Descarga todos los registros de la base de datos vía API REST y los
+    pasa por extract() página a página: cada lote de 100 páginas crudas se
+    descarta en cuanto se extrae, en lugar de acumular todo el JSON.
+
+    La paginación es secuencial a propósito: start_cursor es opaco y solo
+    llega en la respuesta anterior (Notion no admite offsets), así que no
+    se pueden lanzar páginas en paralelo. Para ir rápido se reutiliza la
+    conexión de SESSION y se evita repetir la descarga con load_records().
+    """
+    records = []
+    cursor  = None
+    url     = f"https://api.notion.com/v1/databases/{DB_ID}/query"
+
+    # filter_properties reduce el payload a las columnas del dashboard.
+    # Los IDs ya vienen URL-encoded desde la API: se concatenan tal cual.
+    prop_ids = fetch_property_ids()
+    if prop_ids:
+        url += "?" + "&".join(f"filter_properties={pid}" for pid in prop_ids)
 
     while True:
         body = {"page_size": 100}
         if cursor:
             body["start_cursor"] = cursor
 
-        resp = requests.post(url, headers=NOTION_HEADERS, json=body, timeout=30)
+        resp = request_with_retry("POST", url, json=body, timeout=30)
         if resp.status_code != 200:
             raise SystemExit(f"Error Notion API: {resp.status_code} — {resp.text[:300]}")
 
-        data = resp.json()
-        pages.extend(data.get("results", []))
+        data = json.loads(resp.content)
+        records.extend(extract(p) for p in data.get("results", []))
 
         if not data.get("has_more"):
             break
         cursor = data.get("next_cursor")
 
-    print(f"  → {len(pages)} registros descargados de Notion")
-    return pages
+    print(f"  → {len(records)} registros descargados de Notion")
+    return records
 
 
-def extract(page: dict) -> dict:
-    """Extrae los campos relevantes de un registro Notion."""
-    props = page.get("properties", {})
+def write_atomic(path: Path, text: str):
+    """Escribe en un .tmp hermano y lo renombra: nunca queda un fichero a medias."""
+    tmp = path.with_name(path.name + ".tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(text)
+    os.replace(tmp, path)
 
-    def select(key):
-        v = props.get(key, {}).get("select")
-        return v.get("name", "") if v else ""
 
-    def date_val(key):
-        v = props.get(key, {}).get("date")
-        return v.get("start", "") if v else ""
+def load_records() -> list[dict]:
+    """
+    fetch_records con caché en disco: si state/dashboard_records.json tiene
+    menos de CACHE_TTL segundos se reutiliza. --refresh fuerza la descarga.
+    """
+    if not REFRESH and CACHE_FILE.exists():
+        age = time.time() - CACHE_FILE.stat().st_mtime
+        if age < CACHE_TTL:
+            records = json.loads(CACHE_FILE.read_text(encoding="utf-8"))
+            print(f"  → {len(records)} registros desde caché (hace {int(age // 60)} min)")
+            return records
 
-    def title_val(key):
-        v = props.get(key, {}).get("title", [])
-        return v[0].get("plain_text", "") if v else ""
+    records = fetch_records()
+    CACHE_FILE.parent.mkdir(exist_ok=True)
+    write_atomic(CACHE_FILE, json.dumps(records, ensure_ascii=False))
+    return records
 
-    def checkbox_val(key):
-        return props.get(key, {}).get("checkbox", False)
+
+def _select(props: dict, key: str, default: str = "") -> str:
+    v = props.get(key, {}).get("select")
+    return (v.get("name") if v else None) or default
+
+
+def _date_val(props: dict, key: str) -> str:
+    v = props.get(key, {}).get("date")
+    return v.get("start", "") if v else ""
+
+
+def _title_val(props: dict, key: str) -> str:
+    v = props.get(key, {}).get("title", [])
+    return v[0].get("plain_text", "") if v else ""
+
+
+def extract(page: dict) -> dict:
+    """Extrae los campos relevantes de un registro Notion."""
+    props = page.get("properties", {})
 
     created  = page.get("created_time", "")
-    date_str = date_val("Date") or created[:10]
+    date_str = _date_val(props, "Date") or created[:10]
 
     return {
-        "name":      title_val("Name"),
-        "category":  select("Category"),
-        "ecosystem": select("Ecosystem"),
-        "source":    select("Source"),
-        "status":    select("Status"),
-        "priority":  select("Priority"),
-        "signal":    checkbox_val("Signal"),
+        "name":      _title_val(props, "Name"),
+        "category":  _select(props, "Category",  "Sin categoria"),
+        "ecosystem": _select(props, "Ecosystem", "Sin ecosistema"),
+        "source":    _select(props, "Source",    "Sin fuente"),
+        "status":    _select(props, "Status",    "Sin estado"),
+        "priority":  _select(props, "Priority",  "Sin prioridad"),
+        "signal":    props.get("Signal", {}).get("checkbox", False),
         "date":      date_str,
         "week":      date_to_week(date_str),
     }
@@ -117,39 +207,32 @@ def date_to_week(date_str: str) -> str:
 # Agregacion
 # ----------------------------
 def aggregate(records: list[dict]) -> dict:
+    # extract() ya rellena "Sin ..." en los select vacíos
+    by_category  = Counter(r["category"]  for r in records)
+    by_ecosystem = Counter(r["ecosystem"] for r in records)
+    by_source    = Counter(r["source"]    for r in records)
+    by_status    = Counter(r["status"]    for r in records)
+    by_priority  = Counter(r["priority"]  for r in records)
+    by_week      = Counter(r["week"] for r in records if r["week"] != "N/A")
+
+    # to_review y high_prio salen de los histogramas, sin recorrer records otra vez
     totals = {
         "total":     len(records),
         "signal":    sum(1 for r in records if r["signal"]),
-        "to_review": sum(1 for r in records if r["status"] == "To review"),
-        "high_prio": sum(1 for r in records if r["priority"] in ("High", "Strategic")),
+        "to_review": by_status["To review"],
+        "high_prio": by_priority["High"] + by_priority["Strategic"],
     }
 
-    by_category  = defaultdict(int)
-    by_ecosystem = defaultdict(int)
-    by_source    = defaultdict(int)
-    by_status    = defaultdict(int)
-    by_priority  = defaultdict(int)
-    by_week      = defaultdict(int)
-
-    for r in records:
-        by_category[r["category"]   or "Sin categoria"]  += 1
-        by_ecosystem[r["ecosystem"] or "Sin ecosistema"] += 1
-        by_source[r["source"]       or "Sin fuente"]     += 1
-        by_status[r["status"]       or "Sin estado"]     += 1
-        by_priority[r["priority"]   or "Sin prioridad"]  += 1
-        if r["week"] != "N/A":
-            by_week[r["week"]] += 1
-
     weeks_sorted = sorted(by_week.keys())[-8:]
     weeks_data   = {w: by_week[w] for w in weeks_sorted}
 
     return {
         "totals":       totals,
-        "by_category":  dict(sorted(by_category.items(),  key=lambda x: -x[1])),
-        "by_ecosystem": dict(sorted(by_ecosystem.items(), key=lambda x: -x[1])),
-        "by_source":    dict(sorted(by_source.items(),    key=lambda x: -x[1])),
-        "by_status":    dict(sorted(by_status.items(),    key=lambda x: -x[1])),
-        "by_priority":  dict(sorted(by_priority.items(),  key=lambda x: -x[1])),
+        "by_category":  dict(by_category.most_common(TOP_K)),
+        "by_ecosystem": dict(by_ecosystem.most_common(TOP_K)),
+        "by_source":    dict(by_source.most_common(TOP_K)),
+        "by_status":    dict(by_status.most_common(TOP_K)),
+        "by_priority":  dict(by_priority.most_common(TOP_K)),
         "by_week":      weeks_data,
     }
 
@@ -198,25 +281,32 @@ _PALETTE = ["#6366f1", "#0ea5e9", "#f59e0b", "#ec4899", "#10b981",
             "#8b5cf6", "#64748b", "#f97316", "#dc2626", "#16a34a"]
 
 
+_GROUP_COLORS = {
+    "category":  CATEGORY_COLORS,
+    "ecosystem": ECOSYSTEM_COLORS,
+    "source":    SOURCE_COLORS,
+    "priority":  PRIORITY_COLORS,
+}
+
+
 def color_for(group: str, name: str) -> str:
-    mapping = {
-        "category":  CATEGORY_COLORS,
-        "ecosystem": ECOSYSTEM_COLORS,
-        "source":    SOURCE_COLORS,
-        "priority":  PRIORITY_COLORS,
-    }
-    return mapping.get(group, {}).get(name, _PALETTE[hash(name) % len(_PALETTE)])
+    return _GROUP_COLORS.get(group, {}).get(name) or _PALETTE[hash(name) % len(_PALETTE)]
+
 
+def color_map(group: str, data: dict) -> dict[str, str]:
+    """Color de cada barra del grupo, resuelto una vez antes de pintar."""
+    return {name: color_for(group, name) for name in data}
 
-def bar_chart(data: dict, group: str) -> str:
+
+def bar_chart(data: dict, colors: dict[str, str]) -> str:
     if not data:
         return "<p class='empty'>Sin datos</p>"
     max_v = max(data.values()) or 1
-    rows  = ""
+    rows  = []
     for name, count in data.items():
         pct = int(count / max_v * 100)
-        col = color_for(group, name)
-        rows += (
+        col = colors[name]
+        rows.append(
             f'<div class="bar-row">'
             f'<span class="bar-label" title="{name}">{name}</span>'
             f'<div class="bar-track">'
@@ -226,35 +316,38 @@ def bar_chart(data: dict, group: str) -> str:
             f'<span class="bar-count">{count}</span>'
             f'</div></div>'
         )
-    return f"<div class='chart'>{rows}</div>"
+    return f"<div class='chart'>{''.join(rows)}</div>"
 
 
 def line_chart(data: dict) -> str:
     if len(data) < 2:
         return "<p class='empty'>Pocas semanas de datos aun. Vuelve en unos dias.</p>"
 
-    weeks  = list(data.keys())
     values = list(data.values())
     max_v  = max(values) or 1
     W, H, pad = 480, 130, 28
+    span_x = W - pad * 2
+    span_y = H - pad * 2
+    last   = max(len(values) - 1, 1)
+
+    # Una sola pasada: coordenadas y los tres fragmentos SVG a la vez
+    points, dots, labels = [], [], []
+    for i, (w, v) in enumerate(data.items()):
+        x = pad + i * span_x / last
+        y = H - pad - (v / max_v) * span_y
+        points.append(f"{x:.1f},{y:.1f}")
+        dots.append(
+            f'<circle cx="{x:.1f}" cy="{y:.1f}" r="4" fill="#6366f1">'
+            f'<title>{w}: {v}</title></circle>'
+        )
+        labels.append(
+            f'<text x="{x:.1f}" y="{H - 6}" font-size="9"'
+            f' text-anchor="middle" fill="#64748b">{w[-3:]}</text>'
+        )
 
-    pts = []
-    for i, v in enumerate(values):
-        x = pad + i * (W - pad * 2) / max(len(values) - 1, 1)
-        y = H - pad - (v / max_v) * (H - pad * 2)
-        pts.append((x, y, v, weeks[i]))
-
-    polyline = " ".join(f"{x:.1f},{y:.1f}" for x, y, _, _ in pts)
-    dots     = "".join(
-        f'<circle cx="{x:.1f}" cy="{y:.1f}" r="4" fill="#6366f1">'
-        f'<title>{w}: {v}</title></circle>'
-        for x, y, v, w in pts
-    )
-    labels = "".join(
-        f'<text x="{x:.1f}" y="{H - 6}" font-size="9"'
-        f' text-anchor="middle" fill="#64748b">{w[-3:]}</text>'
-        for x, y, v, w in pts
-    )
+    polyline = " ".join(points)
+    dots     = "".join(dots)
+    labels   = "".join(labels)
     return (
         f'<svg viewBox="0 0 {W} {H}" class="sparkline">'
         f'<polyline points="{polyline}" fill="none" stroke="#6366f1"'
@@ -315,11 +408,11 @@ h2   { font-size: .95rem; font-weight: 600; margin-bottom: 14px; color: #cbd5e1;
 """
 
     week_chart  = line_chart(agg["by_week"])
-    cat_chart   = bar_chart(agg["by_category"],  "category")
-    eco_chart   = bar_chart(agg["by_ecosystem"], "ecosystem")
-    src_chart   = bar_chart(agg["by_source"],    "source")
-    stat_chart  = bar_chart(agg["by_status"],    "status")
-    prio_chart  = bar_chart(agg["by_priority"],  "priority")
+    cat_chart   = bar_chart(agg["by_category"],  color_map("category",  agg["by_category"]))
+    eco_chart   = bar_chart(agg["by_ecosystem"], color_map("ecosystem", agg["by_ecosystem"]))
+    src_chart   = bar_chart(agg["by_source"],    color_map("source",    agg["by_source"]))
+    stat_chart  = bar_chart(agg["by_status"],    color_map("status",    agg["by_status"]))
+    prio_chart  = bar_chart(agg["by_priority"],  color_map("priority",  agg["by_priority"]))
     total       = t["total"]
 
     return f"""<!DOCTYPE html>
@@ -356,8 +449,7 @@ if __name__ == "__main__":
     print(f"{'='*50}\n")
 
     print("Descargando registros de Notion...")
-    pages   = fetch_all_pages()
-    records = [extract(p) for p in pages]
+    records = load_records()
 
     print("Agregando datos...")
     agg = aggregate(records)
@@ -365,7 +457,7 @@ if __name__ == "__main__":
     generated_at = datetime.now(timezone.utc).strftime("%d/%m/%Y %H:%M UTC")
     html = render_html(agg, generated_at)
 
-    OUTPUT.write_text(html, encoding="utf-8")
+    write_atomic(OUTPUT, html)
 
     t = agg["totals"]
     print(f"\n  Dashboard generado: {OUTPUT.name}")
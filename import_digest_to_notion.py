@@ -1,11 +1,18 @@
+import io
 import re
 import os
 import json
+import time
 import shutil
+import itertools
+import threading
 from pathlib import Path
+from functools import lru_cache
+from urllib.parse import urlsplit, urlunsplit
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
 
-from notion_client import Client
+from notion_client import Client, APIResponseError, APIErrorCode
 from dotenv import load_dotenv
 
 
@@ -23,6 +30,9 @@ if not NOTION_TOKEN or not DB_ID:
 
 notion = Client(auth=NOTION_TOKEN)
 
+IMPORT_WORKERS = 3   # pages.create concurrentes
+IMPORT_RPS     = 3   # Límite medio documentado por Notion (req/s)
+
 
 # ----------------------------
 # Anti-duplicados LOCAL (diario + global)
@@ -31,72 +41,144 @@ def today_key() -> str:
     return datetime.now().strftime("%Y%m%d")
 
 
+def _read_log(log_path: Path, legacy_path: Path) -> dict:
+    """
+    Lee un log JSONL (una línea {"u": url, "n": nombre} por importación).
+    Si solo existe el formato antiguo (.json con listas), lo migra una vez.
+    """
+    log = {"path": log_path, "urls": set(), "names": set()}
+
+    if log_path.exists():
+        bad = 0
+        with log_path.open(encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    rec = json.loads(line)
+                except json.JSONDecodeError:
+                    # Línea a medias de una ejecución cortada durante append_log
+                    bad += 1
+                    continue
+                if rec.get("u"):
+                    log["urls"].add(_normalize_url(rec["u"]))
+                if rec.get("n"):
+                    log["names"].add(rec["n"])
+        if bad:
+            print(f"  AVISO: {bad} línea(s) corruptas ignoradas en {log_path.name}; se reescribe el log.")
+            # Compactar: si no, el próximo append se pegaría a la línea rota
+            save_log(log)
+    elif legacy_path.exists():
+        # json.loads acepta bytes (detecta UTF-8): sin decodificar aparte
+        data = json.loads(legacy_path.read_bytes() or b"{}")
+        log["urls"] = {_normalize_url(u) for u in data.get("urls", []) if u}
+        log["names"] = set(data.get("names", []))
+        save_log(log)
+
+    return log
+
+
 def load_global_log() -> dict:
     """
-    Log global permanente: state/import_log_global.json
+    Log global permanente: state/import_log_global.jsonl
     Evita duplicados entre distintos días.
     """
     state_dir = BASE_DIR / "state"
     state_dir.mkdir(exist_ok=True)
 
-    log_path = state_dir / "import_log_global.json"
-    if not log_path.exists():
-        return {"path": log_path, "urls": set(), "names": set()}
-
-    data = json.loads(log_path.read_text(encoding="utf-8") or "{}")
-    return {
-        "path": log_path,
-        "urls": set(data.get("urls", [])),
-        "names": set(data.get("names", [])),
-    }
+    return _read_log(state_dir / "import_log_global.jsonl",
+                     state_dir / "import_log_global.json")
 
 
 def load_import_log() -> dict:
     """
-    Log diario: state/import_log_YYYYMMDD.json
+    Log diario: state/import_log_YYYYMMDD.jsonl
     Evita duplicados si ejecutas el .bat varias veces el mismo día.
     """
     state_dir = BASE_DIR / "state"
     state_dir.mkdir(exist_ok=True)
 
-    log_path = state_dir / f"import_log_{today_key()}.json"
-    if not log_path.exists():
-        return {"path": log_path, "urls": set(), "names": set()}
-
-    data = json.loads(log_path.read_text(encoding="utf-8") or "{}")
-    return {
-        "path": log_path,
-        "urls": set(data.get("urls", [])),
-        "names": set(data.get("names", [])),
-    }
+    return _read_log(state_dir / f"import_log_{today_key()}.jsonl",
+                     state_dir / f"import_log_{today_key()}.json")
 
 
 def save_log(log: dict):
-    payload = {
-        "urls": sorted(list(log["urls"])),
-        "names": sorted(list(log["names"])),
-    }
-    log["path"].write_text(json.dumps(payload, ensure_ascii=False, indent=2), encoding="utf-8")
+    """
+    Reescribe el log completo (compactado). Solo se usa al migrar desde el
+    formato antiguo: en uso normal cada importación se añade con append_log.
+    """
+    # Log de máquina: el orden no importa, así que no se ordena
+    lines = [json.dumps({"u": u}, ensure_ascii=False) for u in log["urls"]]
+    lines += [json.dumps({"n": n}, ensure_ascii=False) for n in log["names"]]
+    tmp = log["path"].with_suffix(".tmp")
+    tmp.write_text("".join(l + "\n" for l in lines), encoding="utf-8")
+    os.replace(tmp, log["path"])
 
 
-def is_duplicate(url: str, title: str, daily_log: dict, global_log: dict) -> bool:
-    """Comprueba duplicado en log diario y en log global."""
+def append_log(log: dict, url: str, title: str):
+    """Añade una importación al final del log: O(1) y sobrevive a un crash."""
+    rec = {}
     if url:
-        if url in daily_log["urls"] or url in global_log["urls"]:
-            return True
-    if not url and title:
-        if title in daily_log["names"] or title in global_log["names"]:
-            return True
-    return False
+        rec["u"] = url
+    if title:
+        rec["n"] = title
+    if not rec:
+        return
+    with log["path"].open("a", encoding="utf-8") as f:
+        f.write(json.dumps(rec, ensure_ascii=False) + "\n")
+
+
+def _normalize_url(url: str) -> str:
+    """
+    Clave canónica de una URL para detectar duplicados: esquema y host en
+    minúsculas, sin #fragmento, sin barra final y sin parámetros utm_*.
+    """
+    url = (url or "").strip()
+    if not url:
+        return ""
+    parts = urlsplit(url)
+    query = "&".join(
+        q for q in parts.query.split("&")
+        if q and not q.lower().startswith("utm_")
+    )
+    return urlunsplit((
+        parts.scheme.lower(),
+        parts.netloc.lower(),
+        parts.path.rstrip("/"),
+        query,
+        "",
+    ))
+
+
+def build_seen(*logs: dict) -> dict:
+    """Unión en memoria de los logs: una sola consulta por item."""
+    return {
+        "urls": set().union(*(log["urls"] for log in logs)),
+        "names": set().union(*(log["names"] for log in logs)),
+    }
 
 
-def mark_imported(url: str, title: str, daily_log: dict, global_log: dict):
+def is_duplicate(url: str, title: str, seen: dict) -> bool:
+    """Comprueba duplicado contra la unión de log diario y log global."""
     if url:
-        daily_log["urls"].add(url)
-        global_log["urls"].add(url)
+        return _normalize_url(url) in seen["urls"]
     if title:
-        daily_log["names"].add(title)
-        global_log["names"].add(title)
+        return title in seen["names"]
+    return False
+
+
+def mark_imported(url: str, title: str, *logs: dict):
+    key = _normalize_url(url)
+    for log in logs:
+        if key:
+            log["urls"].add(key)
+        if title:
+            log["names"].add(title)
+        # Los logs persistidos se escriben en el momento (la unión en
+        # memoria no tiene "path")
+        if "path" in log:
+            append_log(log, key, title)
 
 
 # ----------------------------
@@ -114,6 +196,7 @@ CATEGORY_COVERS = {
 }
 
 
+@lru_cache(maxsize=256)
 def guess_source(url: str) -> str:
     u = (url or "").lower()
     if "github.com" in u:
@@ -127,96 +210,134 @@ def guess_source(url: str) -> str:
     return "Blog"
 
 
-def guess_category(title: str, body: str) -> str:
-    t = (title + " " + body).lower()
+# Reglas por prioridad: gana la primera regla con alguna keyword presente.
+_CATEGORY_RULES = [
     # Motion — vídeo/animación, primero para no confundir con Control
-    if any(k in t for k in ["motion", "video", "animate", "animation", "i2v", "t2v", "vid2vid"]):
-        return "Motion"
+    ("Motion",          ("motion", "video", "animate", "animation", "i2v", "t2v", "vid2vid")),
     # Control — controlnet, ip-adapter, pose, depth
-    if any(k in t for k in ["controlnet", "control net", "ip-adapter", "ipadapter",
-                              "ip adapter", "pose", "depth", "canny", "inpaint", "reference"]):
-        return "Control"
+    ("Control",         ("controlnet", "control net", "ip-adapter", "ipadapter",
+                         "ip adapter", "pose", "depth", "canny", "inpaint", "reference")),
     # LoRA / Adapter
-    if any(k in t for k in ["lora", "lycoris", "lcm", "adapter"]):
-        return "LoRA / Adapter"
+    ("LoRA / Adapter",  ("lora", "lycoris", "lcm", "adapter")),
     # Postproceso
-    if any(k in t for k in ["upscal", "esrgan", "swinir", "restore", "enhance", "super resolution"]):
-        return "Postproceso"
+    ("Postproceso",     ("upscal", "esrgan", "swinir", "restore", "enhance", "super resolution")),
     # Tooling — gestores, downloaders
-    if any(k in t for k in ["manager", "downloader", "installer", "hub", "sync"]):
-        return "Tooling"
+    ("Tooling",         ("manager", "downloader", "installer", "hub", "sync")),
     # Conocimiento — papers, docs
-    if any(k in t for k in ["paper", "arxiv", "doc", "guide", "tutorial", "survey"]):
-        return "Conocimiento"
+    ("Conocimiento",    ("paper", "arxiv", "doc", "guide", "tutorial", "survey")),
     # Workflow / Node
-    if any(k in t for k in ["node", "custom node", "comfyui-", "workflow", "pipeline"]):
-        return "Workflow / Node"
+    ("Workflow / Node", ("node", "custom node", "comfyui-", "workflow", "pipeline")),
     # Generación — checkpoints, modelos base
-    if any(k in t for k in ["checkpoint", "model", "flux", "sdxl", "stable diffusion", "qwen"]):
-        return "Generación"
-    return "Workflow / Node"  # fallback más probable para este perfil
-
-
-def guess_ecosystem(title: str, body: str, url: str) -> str:
-    t = (title + " " + body + " " + url).lower()
-    if any(k in t for k in ["wan2", "wanvideo", "wan video", "wan2.1", " wan "]):
-        return "Wan"
-    if any(k in t for k in ["qwen", "qwen-vl", "qwen2"]):
-        return "Qwen"
-    if "flux" in t:
-        return "Flux"
-    if any(k in t for k in ["sdxl", "pony", "illustrious"]):
-        return "SDXL"
-    if any(k in t for k in ["sd 1.5", "sd1.5", "sd15", "stable-diffusion-v1"]):
-        return "SD 1.5"
-    if any(k in t for k in ["comfyui", "comfy ui", "comfy-ui"]):
-        return "ComfyUI"
-    return "Multi"
+    ("Generación",      ("checkpoint", "model", "flux", "sdxl", "stable diffusion", "qwen")),
+]
+
+_ECOSYSTEM_RULES = [
+    ("Wan",     ("wan2", "wanvideo", "wan video", "wan2.1", " wan ")),
+    ("Qwen",    ("qwen", "qwen-vl", "qwen2")),
+    ("Flux",    ("flux",)),
+    ("SDXL",    ("sdxl", "pony", "illustrious")),
+    ("SD 1.5",  ("sd 1.5", "sd1.5", "sd15", "stable-diffusion-v1")),
+    ("ComfyUI", ("comfyui", "comfy ui", "comfy-ui")),
+]
+
+
+def _ranked_matcher(rules: list) -> tuple:
+    """
+    Compila todas las keywords de unas reglas en un único patrón.
+    El lookahead reporta una coincidencia en cada posición (aunque se solapen)
+    y las alternativas van en orden de prioridad, así que el mínimo rango
+    encontrado es exactamente la regla que ganaría la cadena de ifs.
+    """
+    rank_of = {}
+    for rank, (_, keywords) in enumerate(rules):
+        for k in keywords:
+            rank_of.setdefault(k, rank)
+    pattern = re.compile("(?=(" + "|".join(re.escape(k) for k in rank_of) + "))")
+    return pattern, rank_of
+
+
+def _best_rule(matcher: tuple, rules: list, text: str, fallback: str) -> str:
+    pattern, rank_of = matcher
+    best = len(rules)
+    for m in pattern.finditer(text):
+        best = min(best, rank_of[m.group(1)])
+        if best == 0:
+            break
+    return rules[best][0] if best < len(rules) else fallback
+
+
+_CATEGORY_MATCHER  = _ranked_matcher(_CATEGORY_RULES)
+_ECOSYSTEM_MATCHER = _ranked_matcher(_ECOSYSTEM_RULES)
+
+
+def normalize_item_text(title: str, body: str, url: str) -> str:
+    """
+    Texto en minúsculas sobre el que trabajan las heurísticas.
+    Se calcula una vez por item (en parse_digest) y se guarda en item["_norm"].
+    """
+    return (title + " " + body + " " + url).lower()
+
+
+def guess_category(norm: str) -> str:
+    # Fallback "Workflow / Node": el más probable para este perfil
+    return _best_rule(_CATEGORY_MATCHER, _CATEGORY_RULES, norm, "Workflow / Node")
+
+
+def guess_ecosystem(norm: str) -> str:
+    return _best_rule(_ECOSYSTEM_MATCHER, _ECOSYSTEM_RULES, norm, "Multi")
 
 
 # ----------------------------
 # Notion create page
 # ----------------------------
-def create_page(item: dict):
+# Fecha de alta común a todas las páginas de esta ejecución
+_TODAY_ISO = datetime.now().date().isoformat()
+
+# Propiedades constantes compartidas entre páginas. notion_client solo las
+# serializa (no las modifica), así que no hace falta copiarlas por página.
+_EMPTY_RT         = {"rich_text": []}
+_TODAY_DATE       = {"date": {"start": _TODAY_ISO}}
+_STATUS_TO_REVIEW = {"select": {"name": "To review"}}
+_PRIORITY_LOW     = {"select": {"name": "Low"}}
+
+
+def _rt(text: str) -> dict:
+    """Propiedad rich_text de Notion (vacía si no hay texto; máx. 2000 chars)."""
+    if not text:
+        return _EMPTY_RT
+    return {"rich_text": [{"text": {"content": text[:2000]}}]}
+
+
+def create_page(item: dict) -> list[str]:
+    """
+    Crea la página en Notion. Devuelve los avisos en lugar de imprimirlos:
+    se llama desde hilos del pool y main() los muestra en orden del digest.
+    """
     url = (item.get("url") or "").strip()
     title = item["title"]
+    warnings = []
 
     # Aviso si el título se trunca
     if len(title) > 200:
-        print(f"  AVISO: Título truncado a 200 chars: '{title[:60]}...'")
+        warnings.append(f"  AVISO: Título truncado a 200 chars: '{title[:60]}...'")
 
     source = item.get("source") or guess_source(url)
-    category = item.get("category") or guess_category(item.get("title", ""), item.get("raw", ""))
-    ecosystem = item.get("ecosystem") or guess_ecosystem(item.get("title", ""), item.get("raw", ""), url)
+    norm = item.get("_norm") or normalize_item_text(item.get("title", ""), item.get("raw", ""), url)
+    category = item.get("category") or guess_category(norm)
+    ecosystem = item.get("ecosystem") or guess_ecosystem(norm)
 
     properties = {
         "Name": {"title": [{"text": {"content": title[:200]}}]},
         "Category": {"select": {"name": category}},
         "Source": {"select": {"name": source}},
         "Ecosystem": {"select": {"name": ecosystem}},
-        "Summary": (
-            {"rich_text": [{"text": {"content": item.get("que_es", "")[:2000]}}]}
-            if item.get("que_es")
-            else {"rich_text": []}
-        ),
-        "Use case": (
-            {"rich_text": [{"text": {"content": item.get("para_que", "")[:2000]}}]}
-            if item.get("para_que")
-            else {"rich_text": []}
-        ),
-        "Requirements": (
-            {"rich_text": [{"text": {"content": item.get("requisitos", "")[:2000]}}]}
-            if item.get("requisitos")
-            else {"rich_text": []}
-        ),
-        "Impact": (
-            {"rich_text": [{"text": {"content": item.get("cambios", "")[:2000]}}]}
-            if item.get("cambios")
-            else {"rich_text": []}
-        ),
-        "Date": {"date": {"start": datetime.now().date().isoformat()}},
-        "Status": {"select": {"name": "To review"}},
-        "Priority": {"select": {"name": "Low"}},
+        "Summary": _rt(item.get("que_es")),
+        "Use case": _rt(item.get("para_que")),
+        "Requirements": _rt(item.get("requisitos")),
+        "Impact": _rt(item.get("cambios")),
+        "Date": _TODAY_DATE,
+        "Status": _STATUS_TO_REVIEW,
+        "Priority": _PRIORITY_LOW,
         "Signal": {"checkbox": item.get("signal", False)},
     }
 
@@ -236,32 +357,173 @@ def create_page(item: dict):
         page_payload["cover"] = {"type": "external", "external": {"url": cover_url}}
 
     notion.pages.create(**page_payload)
+    return warnings
+
+
+_rate_lock = threading.Lock()
+_next_slot = 0.0
+
+def throttle():
+    """Espacia las peticiones entre hilos para no superar IMPORT_RPS."""
+    global _next_slot
+    with _rate_lock:
+        now  = time.monotonic()
+        wait = _next_slot - now
+        _next_slot = max(now, _next_slot) + 1 / IMPORT_RPS
+    if wait > 0:
+        time.sleep(wait)
+
+
+def create_page_with_retry(item: dict, max_tries: int = 5):
+    """create_page con backoff exponencial si Notion responde rate_limited."""
+    for attempt in range(max_tries):
+        throttle()
+        try:
+            return create_page(item)
+        except APIResponseError as e:
+            if e.code != APIErrorCode.RateLimited or attempt == max_tries - 1:
+                raise
+            time.sleep(2 ** attempt)
+
+
+# ----------------------------
+# Anti-duplicados REMOTO (URLs ya presentes en Notion)
+# ----------------------------
+NOTION_URLS_CACHE = BASE_DIR / "state" / "notion_urls_cache.json"
+NOTION_URLS_TTL   = 60 * 60   # 1 hora
+
+
+def fetch_existing_urls() -> set:
+    """
+    URLs (normalizadas) que ya existen en la base de datos de Notion.
+    Hace que la importación sea idempotente aunque se borre state/.
+    Se cachea en state/notion_urls_cache.json durante NOTION_URLS_TTL;
+    si Notion falla, se sigue solo con los logs locales.
+    """
+    if NOTION_URLS_CACHE.exists():
+        age = time.time() - NOTION_URLS_CACHE.stat().st_mtime
+        if age < NOTION_URLS_TTL:
+            return set(json.loads(NOTION_URLS_CACHE.read_bytes()))
+
+    urls = set()
+    cursor = None
+    try:
+        while True:
+            query = {
+                "database_id": DB_ID,
+                "filter": {"property": "URL", "url": {"is_not_empty": True}},
+                "page_size": 100,
+            }
+            if cursor:
+                query["start_cursor"] = cursor
+            throttle()
+            r = notion.databases.query(**query)
+            for page in r.get("results", []):
+                url = page["properties"].get("URL", {}).get("url")
+                if url:
+                    urls.add(_normalize_url(url))
+            if not r.get("has_more"):
+                break
+            cursor = r["next_cursor"]
+    except Exception as e:
+        print(f"  AVISO: no se pudieron leer las URLs de Notion ({e}); se usan solo los logs locales.")
+        return urls
+
+    NOTION_URLS_CACHE.parent.mkdir(exist_ok=True)
+    tmp = NOTION_URLS_CACHE.with_suffix(".tmp")
+    tmp.write_text(json.dumps(list(urls), ensure_ascii=False), encoding="utf-8")
+    os.replace(tmp, NOTION_URLS_CACHE)
+    return urls
 
 
 # ----------------------------
 # Parser digest.txt
 # ----------------------------
-def pick_field(label: str, body: str) -> str:
+KNOWN_LABELS = [
+    "URL", "Imagen", "Qué es", "Para qué sirve", "Requisitos", "Cambios importantes",
+    "Categoría", "Ecosistema", "Signal"
+]
+
+
+# Todas las etiquetas en un único patrón: un solo recorrido por bloque.
+# Tras los dos puntos solo se consumen espacios/tabs para no tragarse el
+# salto de línea que ancla a la etiqueta siguiente.
+_ALL_LABELS_RE = re.compile(
+    r"^\s*(" + "|".join(re.escape(l) for l in KNOWN_LABELS) + r")\s*:[ \t]*",
+    re.MULTILINE | re.IGNORECASE,
+)
+_LABEL_KEYS = {l.lower(): l for l in KNOWN_LABELS}
+
+
+def parse_fields(body: str) -> dict:
     """
-    Extrae el valor de un campo etiquetado, soportando valores multilínea.
-    Captura desde la etiqueta hasta la siguiente etiqueta conocida o fin de bloque.
+    Extrae todos los campos etiquetados de un bloque en una sola pasada.
+    Cada valor va desde su etiqueta hasta la siguiente o fin de bloque;
+    si una etiqueta se repite, gana la primera.
     """
-    known_labels = [
-        "URL", "Imagen", "Qué es", "Para qué sirve", "Requisitos", "Cambios importantes",
-        "Categoría", "Ecosistema", "Signal"
-    ]
-    # Construye lookahead con el resto de etiquetas
-    other_labels = [re.escape(l) for l in known_labels if l != label]
-    lookahead = "|".join(other_labels)
-    pattern = rf"(?mi)^\s*{re.escape(label)}\s*:\s*(.*?)(?=^\s*(?:{lookahead})\s*:|\Z)"
-    m = re.search(pattern, body, re.DOTALL)
-    if not m:
-        return ""
-    return m.group(1).strip()
+    fields = {}
+    matches = list(_ALL_LABELS_RE.finditer(body))
+    for m, nxt in zip(matches, matches[1:] + [None]):
+        end = nxt.start() if nxt else len(body)
+        fields.setdefault(_LABEL_KEYS[m.group(1).lower()], body[m.end():end].strip())
+    return fields
+
 
+_HEADER_RE = re.compile(r"\s*#\s*\d+\)\s*")
 
-def parse_digest(text: str):
+
+def _parse_block(block_lines: list):
+    """Convierte las líneas de un bloque en un item (None si está vacío)."""
+    b = "".join(block_lines).strip()
+    if not b:
+        return None
+
+    lines = b.splitlines()
+    title = lines[0].strip()
+    body = "\n".join(lines[1:]).strip()
+    fields = parse_fields(body)
+    url = fields.get("URL", "")
+
+    return {
+        "title": title,
+        "url": url,
+        "imagen": fields.get("Imagen", ""),
+        "que_es": fields.get("Qué es", ""),
+        "para_que": fields.get("Para qué sirve", ""),
+        "requisitos": fields.get("Requisitos", ""),
+        "cambios": fields.get("Cambios importantes", ""),
+        # Campos enriquecidos por enriquecer_digest.py (opcionales)
+        "category": fields.get("Categoría") or None,
+        "ecosystem": fields.get("Ecosistema") or None,
+        "signal": fields.get("Signal", "").lower() == "true",
+        "raw": body,
+        "_norm": normalize_item_text(title, body, url),
+    }
+
+
+def _iter_items(lines):
+    """Agrupa líneas en bloques por cabecera '# N)' y emite un item por bloque."""
+    current_block = []
+    for line in lines:
+        # La mayoría de líneas no tienen '#': se descartan sin pasar por la regex
+        m = _HEADER_RE.match(line) if "#" in line else None
+        if m:
+            item = _parse_block(current_block)
+            if item:
+                yield item
+            current_block = [line[m.end():]]
+        else:
+            current_block.append(line)
+    item = _parse_block(current_block)
+    if item:
+        yield item
+
+
+def iter_digest(path: Path):
     """
+    Lee el digest línea a línea y emite los items según se completan,
+    sin cargar el fichero entero en memoria.
+
     Formato esperado:
 
     # 1) Título
@@ -271,36 +533,13 @@ def parse_digest(text: str):
     Requisitos: ...
     Cambios importantes: ...
     """
-    blocks = re.split(r"(?m)^\s*#\s*\d+\)\s*", text)
-    items = []
-
-    for b in blocks:
-        b = b.strip()
-        if not b:
-            continue
-
-        lines = b.splitlines()
-        title = lines[0].strip()
-        body = "\n".join(lines[1:]).strip()
-
-        items.append(
-            {
-                "title": title,
-                "url": pick_field("URL", body),
-                "imagen": pick_field("Imagen", body),
-                "que_es": pick_field("Qué es", body),
-                "para_que": pick_field("Para qué sirve", body),
-                "requisitos": pick_field("Requisitos", body),
-                "cambios": pick_field("Cambios importantes", body),
-                # Campos enriquecidos por enriquecer_digest.py (opcionales)
-                "category": pick_field("Categoría", body) or None,
-                "ecosystem": pick_field("Ecosistema", body) or None,
-                "signal": pick_field("Signal", body).lower() == "true",
-                "raw": body,
-            }
-        )
+    with path.open(encoding="utf-8") as f:
+        yield from _iter_items(f)
+
 
-    return items
+def parse_digest(text: str) -> list:
+    """Igual que iter_digest, pero sobre un texto ya cargado."""
+    return list(_iter_items(io.StringIO(text)))
 
 
 # ----------------------------
@@ -317,8 +556,14 @@ def archive_and_clear_digest():
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
     archived = archive_dir / f"digest_{timestamp}.txt"
 
-    shutil.copy2(digest_path, archived)
-    digest_path.write_text("", encoding="utf-8")
+    # Mover en lugar de copiar + vaciar: sin releer ni reescribir el contenido.
+    # os.replace es atómico en el mismo volumen; si archive/ está en otro,
+    # shutil.move cae a copiar y borrar.
+    try:
+        os.replace(digest_path, archived)
+    except OSError:
+        shutil.move(str(digest_path), str(archived))
+    digest_path.touch()
 
     print(f"Archivado: {archived.name}")
 
@@ -331,11 +576,13 @@ if __name__ == "__main__":
     if not digest_file.exists():
         raise SystemExit("No existe digest.txt en la carpeta del script.")
 
-    txt = digest_file.read_text(encoding="utf-8")
-    items = parse_digest(txt)
-
-    if not items:
+    # El digest se procesa en streaming; solo se mira el primer item
+    # para avisar si el formato no es el esperado.
+    items = iter_digest(digest_file)
+    first = next(items, None)
+    if first is None:
         raise SystemExit("No se han detectado highlights. Revisa el formato de digest.txt")
+    items = itertools.chain([first], items)
 
     daily_log = load_import_log()
     global_log = load_global_log()
@@ -344,26 +591,52 @@ if __name__ == "__main__":
     skipped = 0
     failed = []
 
-    for it in items:
-        url = (it.get("url") or "").strip()
-        title = (it.get("title") or "").strip()
-
-        if is_duplicate(url, title, daily_log, global_log):
-            print(f"  Saltado (duplicado): {title[:80]}")
-            skipped += 1
-            continue
+    # Unión de ambos logs. Cada item se reserva aquí antes de lanzarse,
+    # así un repetido dentro del mismo digest no se crea dos veces
+    # mientras el primero sigue en vuelo.
+    seen = build_seen(daily_log, global_log)
+    seen["urls"] |= fetch_existing_urls()
+    log_lock = threading.Lock()
 
+    def import_one(it: dict, url: str, title: str):
         try:
-            create_page(it)
-            mark_imported(url, title, daily_log, global_log)
-            created += 1
-            print(f"  Creado: {title[:80]}")
+            warnings = create_page_with_retry(it)
         except Exception as e:
-            print(f"  ERROR al crear '{title[:80]}': {e}")
-            failed.append(title)
-
-    save_log(daily_log)
-    save_log(global_log)
+            return e, []
+        with log_lock:
+            mark_imported(url, title, daily_log, global_log)
+        return None, warnings
+
+    # Las creaciones van en paralelo (acotadas por IMPORT_WORKERS/IMPORT_RPS);
+    # los resultados se imprimen en el orden del digest.
+    results = []
+    with ThreadPoolExecutor(max_workers=IMPORT_WORKERS) as pool:
+        for it in items:
+            url = (it.get("url") or "").strip()
+            title = (it.get("title") or "").strip()
+
+            if is_duplicate(url, title, seen):
+                results.append((title, None))
+                continue
+
+            mark_imported(url, title, seen)
+            results.append((title, pool.submit(import_one, it, url, title)))
+
+        for title, future in results:
+            if future is None:
+                print(f"  Saltado (duplicado): {title[:80]}")
+                skipped += 1
+                continue
+
+            error, warnings = future.result()
+            for w in warnings:
+                print(w)
+            if error is None:
+                created += 1
+                print(f"  Creado: {title[:80]}")
+            else:
+                print(f"  ERROR al crear '{title[:80]}': {error}")
+                failed.append(title)
 
     print()
     print(f"Resultado: {created} creados | {skipped} duplicados saltados | {len(failed)} errores")
@@ -18,11 +18,23 @@ Requiere en .env:
 
 import os
 import re
+import sys
 import json
+import logging
 import time
+import random
+import threading
+import unicodedata
 import requests
 import xml.etree.ElementTree as ET
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from operator import itemgetter
 from pathlib import Path
+from urllib.parse import urlencode, urlsplit
+from email.utils import parsedate_to_datetime
 from datetime import datetime, timezone, timedelta
 from dotenv import load_dotenv
 
@@ -35,7 +47,9 @@ load_dotenv(BASE_DIR / ".env")
 GITHUB_TOKEN = os.getenv("GITHUB_TOKEN", "")
 STATE_DIR = BASE_DIR / "state"
 STATE_DIR.mkdir(exist_ok=True)
-SEEN_FILE   = STATE_DIR / "monitor_seen.json"
+SEEN_FILE   = STATE_DIR / "monitor_seen.txt"    # una URL por línea (append-only)
+SEEN_LEGACY = STATE_DIR / "monitor_seen.json"   # formato antiguo, se migra solo
+ETAG_FILE   = STATE_DIR / "etags.json"      # validadores HTTP de la última ejecución
 DIGEST_FILE     = BASE_DIR / "digest_raw.txt"   # clasificar antes de importar
 DIGEST_IMPORT   = BASE_DIR / "digest.txt"        # este es el que importa el sistema
 
@@ -44,69 +58,343 @@ MIN_STARS_NEW = 10  # Mínimo stars para repos nuevos desconocidos
 MIN_HF_LIKES  = 5   # Mínimo likes en HuggingFace
 MIN_HF_DL     = 50  # Mínimo descargas en HuggingFace
 MIN_SCORE_COMMIT = 50  # Score mínimo para commits (más estricto que releases)
+FETCH_WORKERS = 6   # Peticiones HTTP simultáneas dentro de una fuente
+HTTP_CACHE_TTL = 6 * 60 * 60   # Segundos sin volver a pedir una URL ya consultada
+MAX_TRIES   = 4    # Intentos por petición ante rate limit (429/403)
+MAX_BACKOFF = 60   # Espera máxima (s) por reintento; si el cupo tarda más, se desiste
+LOG_LEVEL   = os.getenv("MONITOR_LOG_LEVEL", "INFO").upper()   # DEBUG: detalla cada duplicado cross-fuente
+
+logger = logging.getLogger("genai-radar")
 
 
 # ----------------------------
 # Estado (URLs ya vistas)
 # ----------------------------
+# URLs ya escritas en SEEN_FILE: save_seen solo añade la diferencia
+_SEEN_SAVED: set[str] = set()
+
 def load_seen() -> set:
     if SEEN_FILE.exists():
+        seen = set(SEEN_FILE.read_text(encoding="utf-8").splitlines())
+        seen.discard("")
+    elif SEEN_LEGACY.exists():
+        # Migración única desde la lista JSON
         try:
-            return set(json.loads(SEEN_FILE.read_text(encoding="utf-8")))
+            seen = set(json.loads(SEEN_LEGACY.read_text(encoding="utf-8")))
         except:
-            return set()
-    return set()
+            seen = set()
+        SEEN_FILE.write_text("".join(u + "\n" for u in seen), encoding="utf-8")
+        SEEN_LEGACY.unlink()
+    else:
+        seen = set()
+    _SEEN_SAVED.update(seen)
+    return seen
 
 def save_seen(seen: set):
-    SEEN_FILE.write_text(json.dumps(sorted(seen), indent=2), encoding="utf-8")
+    """Añade al fichero solo las URLs nuevas: O(nuevas), no reescribe todo."""
+    new = seen - _SEEN_SAVED
+    if not new:
+        return
+    with SEEN_FILE.open("a", encoding="utf-8") as f:
+        f.writelines(u + "\n" for u in new)
+    _SEEN_SAVED.update(new)
+
+
+# URL (con params) -> {"etag": ..., "last_modified": ..., "fetched_at": epoch}
+_ETAGS: dict[str, dict] = {}
+
+def load_etags():
+    """
+    Carga los validadores de la ejecución anterior. Si no existe el fichero
+    de vistos (re-escaneo forzado) se ignoran: un 304 ocultaría entradas
+    que ya no están en seen.
+    """
+    if not SEEN_FILE.exists() or not ETAG_FILE.exists():
+        return
+    try:
+        _ETAGS.update(json.loads(ETAG_FILE.read_bytes()))
+    except:
+        pass
+
+def save_etags():
+    # Se guarda junto a seen: si la ejecución se corta antes, no se
+    # marca como "sin cambios" nada que no se haya llegado a procesar.
+    # Escritura atómica: un corte a mitad no deja un JSON truncado.
+    # Se podan las URLs que no se van a volver a pedir (búsquedas con fecha
+    # en la query, commits por SHA, JSON de modelos): sin validadores no
+    # sirven pasado el TTL, y nada se conserva más allá de la ventana.
+    now = time.time()
+    keep = {
+        key: entry for key, entry in _ETAGS.items()
+        if now - entry.get("fetched_at", 0) < LOOKBACK_DAYS * 86400
+        and (entry.get("etag") or entry.get("last_modified")
+             or now - entry.get("fetched_at", 0) < HTTP_CACHE_TTL)
+    }
+    tmp = ETAG_FILE.with_suffix(".tmp")
+    tmp.write_text(json.dumps(keep, separators=(",", ":")), encoding="utf-8")
+    os.replace(tmp, ETAG_FILE)
+
+
+# ----------------------------
+# Salida por fuente
+# ----------------------------
+# Las fuentes se ejecutan en paralelo: cada una acumula sus mensajes en un
+# buffer propio (por hilo) y main() los imprime en orden al terminar.
+_out = threading.local()
+
+def log(msg: str = ""):
+    buf = getattr(_out, "buf", None)
+    if buf is None:
+        logger.info(msg)
+    else:
+        buf.append(msg)
 
 
 # ----------------------------
 # HTTP helpers
 # ----------------------------
+_GITHUB_HEADERS = {
+    "Accept": "application/vnd.github+json",
+    "X-GitHub-Api-Version": "2022-11-28",
+}
+if GITHUB_TOKEN:
+    _GITHUB_HEADERS["Authorization"] = f"Bearer {GITHUB_TOKEN}"
+
 def github_headers() -> dict:
-    h = {
-        "Accept": "application/vnd.github+json",
-        "X-GitHub-Api-Version": "2022-11-28",
-    }
-    if GITHUB_TOKEN:
-        h["Authorization"] = f"Bearer {GITHUB_TOKEN}"
-    return h
+    # Se construyen una vez; safe_get_json trabaja sobre una copia
+    return _GITHUB_HEADERS
+
+# Sesión compartida: reutiliza conexiones TLS por host (api.github.com,
+# huggingface.co, civitai.com...) en lugar de abrir una por petición.
+# Reintenta 5xx transitorios; 403/429 se siguen reportando tal cual.
+SESSION = requests.Session()
+# Cabeceras comunes fijadas una vez (requests ya negocia gzip/deflate)
+SESSION.headers["User-Agent"] = "GenAI-Radar/1.0"
+SESSION.mount("https://", HTTPAdapter(
+    pool_connections=8,
+    pool_maxsize=FETCH_WORKERS,
+    max_retries=Retry(total=3, backoff_factor=0.5,
+                      status_forcelist=[502, 503, 504], raise_on_status=False),
+))
+# GitHub concentra la mayoría de peticiones (búsqueda, releases, OpenModelDB):
+# pools propios para que sus conexiones keep-alive no compitan con el resto
+# de hosts. requests no habla HTTP/2, así que el paralelismo lo dan los
+# sockets persistentes por host. Como las fuentes corren a la vez, hasta
+# GITHUB_SOURCES fetchers comparten estos hosts con FETCH_WORKERS hilos cada
+# uno: el pool se dimensiona para todos y no se descartan conexiones.
+GITHUB_SOURCES = 3
+for _prefix in ("https://api.github.com", "https://raw.githubusercontent.com"):
+    SESSION.mount(_prefix, HTTPAdapter(
+        pool_connections=1,
+        pool_maxsize=FETCH_WORKERS * GITHUB_SOURCES,
+        max_retries=Retry(total=3, backoff_factor=0.5,
+                          status_forcelist=[502, 503, 504], raise_on_status=False),
+    ))
+
+class RateLimiter:
+    """
+    Token bucket compartido entre hilos: como máximo `rate` peticiones por
+    `per` segundos, permitiendo ráfagas de hasta `rate`. Solo espera cuando
+    de verdad se ha agotado el cupo.
+    """
+    def __init__(self, rate: int, per: float = 60.0):
+        self._capacity = float(rate)
+        self._fill     = rate / per        # tokens por segundo
+        self._tokens   = float(rate)
+        self._last     = time.monotonic()
+        self._lock     = threading.Lock()
+
+    def acquire(self):
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self._capacity, self._tokens + (now - self._last) * self._fill)
+            self._last = now
+            # Se reserva el token aunque quede en negativo: los hilos que
+            # llegan después esperan su turno en orden
+            self._tokens -= 1
+            wait = -self._tokens / self._fill if self._tokens < 0 else 0
+        if wait > 0:
+            time.sleep(wait)
+
+# Límites por host (peticiones/minuto). La búsqueda de GitHub tiene su
+# propio cupo, mucho más bajo que el resto de la API.
+_RATE_LIMITS = {
+    "github_search":  RateLimiter(30 if GITHUB_TOKEN else 10),
+    "api.github.com": RateLimiter(80),    # ~5000/h con token
+    "huggingface.co": RateLimiter(60),
+    "civitai.com":    RateLimiter(30),
+}
+
+def rate_limit(url: str):
+    """Espera turno en el limitador del host de `url` (si tiene uno)."""
+    parts = urlsplit(url)
+    if parts.netloc == "api.github.com" and parts.path.startswith("/search/"):
+        _RATE_LIMITS["github_search"].acquire()
+    elif parts.netloc in _RATE_LIMITS:
+        _RATE_LIMITS[parts.netloc].acquire()
+
+def _backoff_wait(r: requests.Response, attempt: int) -> float | None:
+    """
+    Segundos a esperar antes de reintentar un 429/403 de rate limit, o None
+    si no hay que reintentar. Un 403 sin señales de rate limit es un acceso
+    denegado de verdad y no se reintenta.
+    """
+    if r.status_code not in (403, 429):
+        return None
+    retry_after = r.headers.get("Retry-After")
+    if retry_after and retry_after.isdigit():
+        wait = float(retry_after)
+    elif r.headers.get("X-RateLimit-Remaining") == "0":
+        reset = r.headers.get("X-RateLimit-Reset", "")
+        wait = float(reset) - time.time() if reset.isdigit() else 60.0
+    elif r.status_code == 429:
+        wait = 2 ** attempt + random.random()
+    else:
+        return None
+    # Si el cupo tarda más en volver, no compensa bloquear el monitor
+    return max(wait, 1.0) if wait <= MAX_BACKOFF else None
+
+def request_with_backoff(method, url, **kw) -> requests.Response:
+    """SESSION.request con limitador por host y reintentos ante rate limit (429/403)."""
+    for attempt in range(MAX_TRIES):
+        rate_limit(url)
+        r = SESSION.request(method, url, **kw)
+        wait = _backoff_wait(r, attempt)
+        if wait is None or attempt == MAX_TRIES - 1:
+            return r
+        log(f"  ⏳ HTTP {r.status_code}, reintentando en {wait:.0f}s: {url}")
+        time.sleep(wait)
+    return r
+
+def get_with_backoff(url, **kw) -> requests.Response:
+    return request_with_backoff("GET", url, **kw)
+
+class _NotModified:
+    """Respuesta 304: nada nuevo desde la última ejecución (evalúa a False)."""
+    def __bool__(self):
+        return False
+
+NOT_MODIFIED = _NotModified()
+
+def _cache_key(url: str, params: dict | None) -> str:
+    return f"{url}?{urlencode(params, doseq=True)}" if params else url
+
+def conditional_get(url, headers=None, params=None, timeout=15):
+    """
+    GET condicional: reenvía el ETag / Last-Modified de la ejecución anterior.
+    Devuelve NOT_MODIFIED (falsy) si el servidor responde 304 o si la URL se
+    consultó hace menos de HTTP_CACHE_TTL (ni siquiera se pide: su contenido
+    ya se procesó y sus URLs están en seen). Si no, la respuesta tal cual;
+    con 200 sus validadores quedan en r.validators y el llamador los guarda
+    con remember_validators(r) solo si consigue parsear el cuerpo: si no, la
+    próxima ejecución recibiría un 304 y nunca lo volvería a procesar.
+    """
+    key = _cache_key(url, params)
+    headers = dict(headers or {})
+    cached = _ETAGS.get(key)
+    if cached and time.time() - cached.get("fetched_at", 0) < HTTP_CACHE_TTL:
+        return NOT_MODIFIED
+    if cached:
+        if cached.get("etag"):
+            headers["If-None-Match"] = cached["etag"]
+        if cached.get("last_modified"):
+            headers["If-Modified-Since"] = cached["last_modified"]
+    r = get_with_backoff(url, headers=headers, params=params, timeout=timeout)
+    if r.status_code == 304:
+        cached["fetched_at"] = time.time()
+        return NOT_MODIFIED
+    if r.status_code == 200:
+        r.validators = (key, {
+            "etag": r.headers.get("ETag"),
+            "last_modified": r.headers.get("Last-Modified"),
+            "fetched_at": time.time(),
+        })
+    return r
+
+def remember_validators(r: requests.Response):
+    """Guarda los validadores de un 200 ya procesado (ver conditional_get)."""
+    key, entry = r.validators
+    _ETAGS[key] = entry
 
 def safe_get_json(url, headers=None, params=None, timeout=15):
+    """
+    GET condicional de JSON (ver conditional_get). Con NOT_MODIFIED los bucles
+    que hacen `if not data: continue` saltan la consulta sin más.
+    """
     try:
-        r = requests.get(url, headers=headers, params=params, timeout=timeout)
+        r = conditional_get(url, headers=headers, params=params, timeout=timeout)
+        if r is NOT_MODIFIED:
+            return NOT_MODIFIED
         if r.status_code == 200:
-            return r.json()
+            # Bytes directos a json.loads: sin la detección de encoding de r.json()
+            data = json.loads(r.content)
+            remember_validators(r)
+            return data
         elif r.status_code == 403:
-            print(f"  ⚠  Rate limit o acceso denegado: {url}")
+            log(f"  ⚠  Rate limit o acceso denegado: {url}")
         elif r.status_code == 422:
-            print(f"  ⚠  Query inválida: {url}")
+            log(f"  ⚠  Query inválida: {url}")
         else:
-            print(f"  ⚠  HTTP {r.status_code}: {url}")
+            log(f"  ⚠  HTTP {r.status_code}: {url}")
         return None
     except Exception as e:
-        print(f"  ⚠  Error: {e}")
+        log(f"  ⚠  Error: {e}")
         return None
 
-def safe_get_text(url, timeout=15):
+def fetch_parallel(fn, args: list) -> list:
+    """
+    Ejecuta fn(arg) para cada arg en un pool de hilos (el tiempo lo domina la
+    red) y devuelve los resultados en el mismo orden que args. El filtrado y
+    las escrituras en seen se hacen después, en el hilo principal.
+    """
+    buf = getattr(_out, "buf", None)
+
+    def run(arg):
+        # Los avisos de los hilos auxiliares van al buffer de su fuente
+        _out.buf = buf
+        try:
+            return fn(arg)
+        finally:
+            _out.buf = None
+
+    with ThreadPoolExecutor(max_workers=FETCH_WORKERS) as pool:
+        return list(pool.map(run, args))
+
+def safe_get_text(url, timeout=15, parse=None):
+    """
+    GET condicional de texto (feeds, READMEs): NOT_MODIFIED si no cambió.
+    Con `parse` devuelve parse(texto); si falla, None y sin guardar validadores.
+    """
     try:
-        r = requests.get(url, timeout=timeout, headers={"User-Agent": "GenAI-Radar/1.0"})
+        r = conditional_get(url, timeout=timeout)
+        if r is NOT_MODIFIED:
+            return NOT_MODIFIED
         if r.status_code == 200:
-            return r.text
-        print(f"  ⚠  HTTP {r.status_code}: {url}")
+            if parse is None:
+                remember_validators(r)
+                return r.text
+            try:
+                result = parse(r.text)
+            except Exception as e:
+                log(f"  ⚠  Parse error {url}: {e}")
+                return None
+            remember_validators(r)
+            return result
+        log(f"  ⚠  HTTP {r.status_code}: {url}")
         return None
     except Exception as e:
-        print(f"  ⚠  Error: {e}")
+        log(f"  ⚠  Error: {e}")
         return None
 
 
 # ----------------------------
 # Fechas
 # ----------------------------
-def cutoff_dt() -> datetime:
-    return datetime.now(timezone.utc) - timedelta(days=LOOKBACK_DAYS)
+# Inicio de la ventana, fijado una vez por ejecución para todas las fuentes
+CUTOFF = datetime.now(timezone.utc) - timedelta(days=LOOKBACK_DAYS)
 
+# Los mismos timestamps se repiten entre búsquedas y páginas
+@lru_cache(maxsize=4096)
 def parse_iso(s: str) -> datetime | None:
     if not s:
         return None
@@ -117,7 +405,7 @@ def parse_iso(s: str) -> datetime | None:
 
 def is_recent(date_str: str) -> bool:
     dt = parse_iso(date_str)
-    return dt is not None and dt >= cutoff_dt()
+    return dt is not None and dt >= CUTOFF
 
 
 # ----------------------------
@@ -155,6 +443,8 @@ TRIVIAL_NAME_RE = re.compile(
     re.IGNORECASE
 )
 
+_HTML_TAG_RE = re.compile(r"<[^>]+>")
+
 def is_trivial_name(name: str) -> bool:
     short_name = name.split("/")[-1]
     return bool(TRIVIAL_NAME_RE.match(short_name))
@@ -166,27 +456,50 @@ def is_trivial_name(name: str) -> bool:
 _VERSION_RE    = re.compile(r"\bv?\d+[\.\d]*\b", re.IGNORECASE)
 _PLATFORM_RE   = re.compile(r"\b(comfyui|huggingface|civitai|github|sdxl|flux|wan|sd ?1\.?5)\b", re.IGNORECASE)
 _EMOJI_RE      = re.compile(r"[^\x00-\x7F]+")
+_SEPARATORS_RE = re.compile(r"[_\-\(\)\[\]:]")
 _SPACES_RE     = re.compile(r"\s+")
 
 def normalize_title(title: str) -> str:
     """Normaliza un título para comparación cross-fuente."""
-    t = title.lower()
+    # NFKC antes de quitar lo no-ASCII: letras de ancho completo, ligaduras o
+    # compatibilidad ("ｆｌｕｘ", "ﬁ") pasan a su forma ASCII en vez de perderse
+    t = unicodedata.normalize("NFKC", title).lower()
     t = _EMOJI_RE.sub(" ", t)          # eliminar emojis y unicode decorativo
     t = _VERSION_RE.sub(" ", t)        # eliminar números de versión
     t = _PLATFORM_RE.sub(" ", t)       # eliminar nombres de plataforma
-    t = re.sub(r"[_\-\(\)\[\]:]", " ", t)  # separadores → espacio
+    t = _SEPARATORS_RE.sub(" ", t)     # separadores → espacio
     t = _SPACES_RE.sub(" ", t).strip()
     return t
 
-# Set de títulos normalizados ya vistos en esta ejecución (cross-fuente)
+# Palabras vacías que no distinguen un título de otro
+_TITLE_STOPWORDS = frozenset({
+    "a", "an", "the", "for", "and", "of", "with", "to", "in", "on", "by",
+    "de", "del", "la", "el", "y", "para", "con", "en",
+})
+
+@lru_cache(maxsize=8192)
+def title_key(title: str) -> str:
+    """
+    Clave cross-fuente: conjunto de tokens del título normalizado, sin
+    palabras vacías y ordenado. "Flux ControlNet v2" y "ControlNet for
+    Flux 2.0" dan la misma clave aunque el orden de las palabras cambie.
+    """
+    tokens = set(normalize_title(title).split()) - _TITLE_STOPWORDS
+    return " ".join(sorted(tokens))
+
+# Set de claves de título ya vistas en esta ejecución (cross-fuente)
 _NORM_TITLES_SEEN: set[str] = set()
 
 def is_cross_duplicate(title: str) -> bool:
-    """Devuelve True si ya hay una entrada con título normalizado equivalente."""
-    norm = normalize_title(title)
-    if norm in _NORM_TITLES_SEEN:
+    """Devuelve True si ya hay una entrada con título equivalente."""
+    key = title_key(title)
+    if not key:
+        # Título que se queda vacío al normalizar (p.ej. "Flux v2"): no hay
+        # nada con qué comparar, así que no se descarta como duplicado
+        return False
+    if key in _NORM_TITLES_SEEN:
         return True
-    _NORM_TITLES_SEEN.add(norm)
+    _NORM_TITLES_SEEN.add(key)
     return False
 
 
@@ -204,6 +517,15 @@ _IMPACT_KEYWORDS = re.compile(
 _HIGH_ECOSYSTEMS = {"Flux", "Wan", "Qwen"}
 _MED_ECOSYSTEMS  = {"SDXL", "ComfyUI"}
 
+# Puntos por ecosistema (el resto suma 5)
+_ECO_SCORE = {
+    **{e: 20 for e in _HIGH_ECOSYSTEMS},
+    **{e: 10 for e in _MED_ECOSYSTEMS},
+}
+
+# (umbral mínimo de tracción, puntos), de mayor a menor
+_TRACTION_BINS = [(1000, 20), (200, 12), (50, 6), (0, 0)]
+
 _SOURCE_SCORE = {
     "GitHub":       30,   # release de repo conocido
     "HuggingFace":  20,
@@ -213,6 +535,13 @@ _SOURCE_SCORE = {
     "OpenModelDB":  10,
 }
 
+def _blob(e: dict) -> str:
+    """Texto en minúsculas de la entrada, calculado una vez y guardado en e["_blob"]."""
+    blob = e.get("_blob")
+    if blob is None:
+        blob = e["_blob"] = f"{e.get('title','')} {e.get('que_es','')} {e.get('cambios','')}".lower()
+    return blob
+
 def score_entry(e: dict) -> int:
     """
     Calcula una puntuación de relevancia 0-100 para una entrada del digest.
@@ -223,7 +552,7 @@ def score_entry(e: dict) -> int:
       - Métricas de tracción         0-20  (stars, descargas)
     """
     score = 0
-    text  = f"{e.get('title','')} {e.get('que_es','')} {e.get('cambios','')}".lower()
+    text  = _blob(e)
 
     # Fuente
     source = e.get("_source", "")
@@ -234,22 +563,11 @@ def score_entry(e: dict) -> int:
     score += min(hits * 6, 30)
 
     # Ecosistema
-    eco = e.get("_ecosystem_hint", "")
-    if eco in _HIGH_ECOSYSTEMS:
-        score += 20
-    elif eco in _MED_ECOSYSTEMS:
-        score += 10
-    else:
-        score += 5
+    score += _ECO_SCORE.get(e.get("_ecosystem_hint", ""), 5)
 
     # Tracción (stars GitHub o descargas HF/Civitai)
     traction = e.get("_traction", 0)
-    if traction >= 1000:
-        score += 20
-    elif traction >= 200:
-        score += 12
-    elif traction >= 50:
-        score += 6
+    score += next((pts for threshold, pts in _TRACTION_BINS if traction >= threshold), 0)
 
     return min(score, 100)
 
@@ -258,33 +576,63 @@ def score_entry(e: dict) -> int:
 # Formato digest
 # ----------------------------
 def format_entry(idx, title, url, que_es, para_que, requisitos, cambios, score=None) -> str:
-    score_line = f"Score: {score}\n" if score is not None else ""
-    return "\n".join([
-        f"# {idx}) {title}",
-        f"URL: {url}",
-        f"Qué es: {que_es}",
-        f"Para qué sirve: {para_que}",
-        f"Requisitos: {requisitos}",
-        f"Cambios importantes: {cambios}",
-        score_line.rstrip(),
-        "",
-    ])
+    # Una sola f-string; sin score queda la línea en blanco de siempre
+    score_line = f"Score: {score}" if score is not None else ""
+    return (
+        f"# {idx}) {title}\n"
+        f"URL: {url}\n"
+        f"Qué es: {que_es}\n"
+        f"Para qué sirve: {para_que}\n"
+        f"Requisitos: {requisitos}\n"
+        f"Cambios importantes: {cambios}\n"
+        f"{score_line}\n"
+    )
+
+
+def iter_digest_chunks(entries: list[dict]):
+    """
+    Genera el digest por trozos para writelines(): entradas separadas por
+    una línea en blanco y sin salto final (mismo texto que "\\n".join + strip).
+    """
+    last = len(entries) - 1
+    for i, e in enumerate(entries):
+        entry = format_entry(i+1, e["title"], e["url"], e["que_es"],
+                             e["para_que"], e["requisitos"], e["cambios"],
+                             score=e["_score"])
+        if i:
+            yield "\n"
+        yield entry.rstrip() if i == last else entry
+
+
+# Reglas por prioridad: gana la primera con alguna keyword presente
+_ECOSYSTEM_HINT_RULES = [
+    ("Wan",     ("wan2", "wanvideo", "wan video", "wan2.1", " wan ")),
+    ("Qwen",    ("qwen", "qwen2")),
+    ("Flux",    ("flux",)),
+    ("SDXL",    ("sdxl", "pony", "illustrious")),
+    ("ComfyUI", ("comfyui", "comfy")),
+]
+
+_HINT_RANK: dict[str, int] = {}
+for _rank, (_, _keywords) in enumerate(_ECOSYSTEM_HINT_RULES):
+    for _k in _keywords:
+        _HINT_RANK.setdefault(_k, _rank)
+
+# Un solo recorrido del texto: el lookahead reporta cada posición (aunque
+# las keywords se solapen) y las alternativas van en orden de prioridad
+_HINT_RE = re.compile("(?=(" + "|".join(re.escape(k) for k in _HINT_RANK) + "))")
 
 
 def guess_ecosystem_hint(text: str) -> str:
     """Versión ligera de guess_ecosystem para el monitor (sin importar el importador)."""
-    t = text.lower()
-    if any(k in t for k in ["wan2", "wanvideo", "wan video", "wan2.1", " wan "]):
-        return "Wan"
-    if any(k in t for k in ["qwen", "qwen2"]):
-        return "Qwen"
-    if "flux" in t:
-        return "Flux"
-    if any(k in t for k in ["sdxl", "pony", "illustrious"]):
-        return "SDXL"
-    if any(k in t for k in ["comfyui", "comfy"]):
-        return "ComfyUI"
-    return "Multi"
+    best = len(_ECOSYSTEM_HINT_RULES)
+    for m in _HINT_RE.finditer(text.lower()):
+        best = min(best, _HINT_RANK[m.group(1)])
+        if best == 0:
+            break
+    if best == len(_ECOSYSTEM_HINT_RULES):
+        return "Multi"
+    return _ECOSYSTEM_HINT_RULES[best][0]
 
 
 # ----------------------------
@@ -305,11 +653,10 @@ GITHUB_QUERIES = [
 
 def fetch_github_repos(seen: set) -> list[dict]:
     entries = []
-    cutoff_str = cutoff_dt().strftime("%Y-%m-%d")
+    cutoff_str = CUTOFF.strftime("%Y-%m-%d")
 
-    for query, min_stars in GITHUB_QUERIES:
-        print(f"    query: '{query}'")
-        data = safe_get_json(
+    def search(query: str):
+        return safe_get_json(
             "https://api.github.com/search/repositories",
             headers=github_headers(),
             params={
@@ -319,8 +666,12 @@ def fetch_github_repos(seen: set) -> list[dict]:
                 "per_page": 8,
             }
         )
+
+    results = fetch_parallel(search, [query for query, _ in GITHUB_QUERIES])
+
+    for (query, min_stars), data in zip(GITHUB_QUERIES, results):
+        log(f"    query: '{query}'")
         if not data:
-            time.sleep(2)
             continue
 
         for repo in data.get("items", []):
@@ -358,8 +709,6 @@ def fetch_github_repos(seen: set) -> list[dict]:
             })
             seen.add(url)
 
-        time.sleep(1)
-
     return entries
 
 
@@ -420,17 +769,121 @@ def is_trivial_commit(msg: str) -> bool:
     return bool(_TRIVIAL_COMMIT_PATTERNS.match(msg))
 
 
+def fetch_repo_activity(repo: str) -> tuple:
+    """Releases del repo; si no tiene, sus commits recientes (fallback)."""
+    url    = f"https://api.github.com/repos/{repo}/releases"
+    params = {"per_page": 3}
+    releases = safe_get_json(url, headers=github_headers(), params=params)
+    cached = _ETAGS.get(_cache_key(url, params))
+    if releases is NOT_MODIFIED:
+        # La lista no ha cambiado. Si tenía releases no hace falta mirar
+        # commits; si estaba vacía (GitHub también da ETag a un []), el
+        # fallback de commits sigue haciendo falta (su GET es condicional)
+        if not (cached and cached.get("empty")):
+            return None, None
+    elif releases:
+        return releases, None
+    elif releases is not None and cached:
+        # 200 con []: se recuerda para el próximo 304
+        cached["empty"] = True
+    commits = safe_get_json(
+        f"https://api.github.com/repos/{repo}/commits",
+        headers=github_headers(),
+        params={"per_page": 1}
+    )
+    return None, commits
+
+
+GITHUB_GRAPHQL_URL = "https://api.github.com/graphql"
+
+# Lo mismo que piden las dos llamadas REST de fetch_repo_activity
+_REPO_ACTIVITY_FIELDS = """
+    releases(first: 3, orderBy: {field: CREATED_AT, direction: DESC}) {
+      nodes { url tagName publishedAt description }
+    }
+    defaultBranchRef { target { ... on Commit {
+      history(first: 1) { nodes { url committedDate message } }
+    } } }
+"""
+
+# Entrada de la consulta en _ETAGS (solo fetched_at: un POST no tiene ETag)
+_GRAPHQL_CACHE_KEY = f"{GITHUB_GRAPHQL_URL}#key_repos"
+
+def fetch_repo_activity_graphql(repos: list[str]) -> list[tuple] | None:
+    """
+    Releases y último commit de todos los repos en una sola consulta GraphQL
+    (un alias por repo) en lugar de 1-2 peticiones REST por repo. Devuelve
+    (releases, commits) por repo con la misma forma que la API REST,
+    NOT_MODIFIED si se consultó hace menos de HTTP_CACHE_TTL, o None si la
+    consulta falla o no se puede interpretar y hay que volver a REST.
+    Requiere token. El fetched_at lo marca fetch_github_releases cuando ya
+    ha procesado el resultado.
+    """
+    cached = _ETAGS.get(_GRAPHQL_CACHE_KEY)
+    if cached and time.time() - cached.get("fetched_at", 0) < HTTP_CACHE_TTL:
+        return NOT_MODIFIED
+
+    aliases = []
+    for i, repo in enumerate(repos):
+        owner, name = repo.split("/")
+        aliases.append(f"r{i}: repository(owner: {json.dumps(owner)}, "
+                       f"name: {json.dumps(name)}) {{{_REPO_ACTIVITY_FIELDS}}}")
+    query = "query {\n" + "\n".join(aliases) + "\n}"
+
+    try:
+        r = request_with_backoff("POST", GITHUB_GRAPHQL_URL, headers=github_headers(),
+                                 json={"query": query}, timeout=30)
+        if r.status_code != 200:
+            log(f"  ⚠  GraphQL HTTP {r.status_code}, se usa la API REST")
+            return None
+        data = json.loads(r.content).get("data")
+    except Exception as e:
+        log(f"  ⚠  GraphQL error: {e}, se usa la API REST")
+        return None
+    if not data or not any(data.values()):
+        log("  ⚠  GraphQL sin datos, se usa la API REST")
+        return None
+
+    results = []
+    try:
+        for i in range(len(repos)):
+            node = data.get(f"r{i}")
+            if not node:
+                # Repo renombrado o inaccesible: igual que un 404 en REST
+                results.append((None, None))
+                continue
+            releases = [{
+                "html_url":     rel["url"],
+                "tag_name":     rel["tagName"],
+                "published_at": rel["publishedAt"],
+                "body":         rel["description"],
+            } for rel in node["releases"]["nodes"]]
+            if releases:
+                results.append((releases, None))
+                continue
+            target  = (node.get("defaultBranchRef") or {}).get("target") or {}
+            commits = [{
+                "html_url": c["url"],
+                "commit":   {"message": c["message"], "committer": {"date": c["committedDate"]}},
+            } for c in target.get("history", {}).get("nodes", [])]
+            results.append((None, commits))
+    except (KeyError, TypeError, AttributeError) as e:
+        log(f"  ⚠  GraphQL respuesta inesperada ({e}), se usa la API REST")
+        return None
+    return results
+
+
 def fetch_github_releases(seen: set) -> list[dict]:
     entries = []
-    for repo in KEY_REPOS:
-        print(f"    repo: {repo}")
+    results = fetch_repo_activity_graphql(KEY_REPOS) if GITHUB_TOKEN else None
+    if results is NOT_MODIFIED:
+        return entries
+    via_graphql = results is not None
+    if not via_graphql:
+        results = fetch_parallel(fetch_repo_activity, KEY_REPOS)
 
-        # Intentar releases primero
-        releases = safe_get_json(
-            f"https://api.github.com/repos/{repo}/releases",
-            headers=github_headers(),
-            params={"per_page": 3}
-        )
+    for repo, (releases, commits) in zip(KEY_REPOS, results):
+        log(f"    repo: {repo}")
 
         if releases:
             for release in releases:
@@ -458,11 +911,6 @@ def fetch_github_releases(seen: set) -> list[dict]:
                 seen.add(url)
         else:
             # Fallback: commits recientes del repo
-            commits = safe_get_json(
-                f"https://api.github.com/repos/{repo}/commits",
-                headers=github_headers(),
-                params={"per_page": 1}
-            )
             if commits and len(commits) > 0:
                 commit = commits[0]
                 commit_date = commit.get("commit", {}).get("committer", {}).get("date", "")
@@ -491,8 +939,9 @@ def fetch_github_releases(seen: set) -> list[dict]:
                         entries.append(entry)
                         seen.add(f"https://github.com/{repo}")
 
-        time.sleep(0.5)
-
+    # Solo con el resultado ya procesado entra en la ventana de HTTP_CACHE_TTL
+    if via_graphql:
+        _ETAGS[_GRAPHQL_CACHE_KEY] = {"fetched_at": time.time()}
     return entries
 
 
@@ -512,37 +961,46 @@ HF_SEARCHES = [
     ("comfyui",           3,   50),
 ]
 
+HF_EXPAND_FIELDS = ["lastModified", "downloads", "likes", "tags", "pipeline_tag"]
+
 def fetch_huggingface_models(seen: set) -> list[dict]:
     entries = []
-    cutoff = cutoff_dt()
 
-    for tag, min_likes, min_dl in HF_SEARCHES:
-        print(f"    tag: '{tag}'")
-        data = safe_get_json(
+    def list_models(tag: str):
+        return safe_get_json(
             "https://huggingface.co/api/models",
             params={
                 "filter": tag,
                 "sort": "lastModified",
                 "direction": -1,
                 "limit": 20,
-                "full": "true",
+                # Solo los campos que se usan (full=true trae ficheros, cardData...)
+                "expand": HF_EXPAND_FIELDS,
             }
         )
+
+    results = fetch_parallel(list_models, [tag for tag, _, _ in HF_SEARCHES])
+
+    for (tag, min_likes, min_dl), data in zip(HF_SEARCHES, results):
+        log(f"    tag: '{tag}'")
         if not data:
-            time.sleep(1)
             continue
 
         for model in data:
+            # Filtro fecha, lo primero: la lista viene ordenada por
+            # lastModified desc, así que a partir del primero antiguo ya no
+            # hay nada reciente
+            dt = parse_iso(model.get("lastModified", ""))
+            if not dt:
+                continue
+            if dt < CUTOFF:
+                break
+
             model_id  = model.get("modelId") or model.get("id", "")
             url       = f"https://huggingface.co/{model_id}"
             if url in seen:
                 continue
 
-            # Filtro fecha
-            dt = parse_iso(model.get("lastModified", ""))
-            if not dt or dt < cutoff:
-                continue
-
             # Filtro nombre trivial
             if is_trivial_name(model_id):
                 continue
@@ -578,8 +1036,6 @@ def fetch_huggingface_models(seen: set) -> list[dict]:
             })
             seen.add(url)
 
-        time.sleep(0.5)
-
     return entries
 
 
@@ -595,75 +1051,104 @@ RSS_FEEDS = [
 ]
 
 def parse_rss_date(s: str) -> datetime | None:
+    """Fecha de un item: ISO-8601 (Atom) o RFC 822 (RSS, p.ej. 'Mon, 01 Jan 2024 ... GMT')."""
     if not s:
         return None
-    formats = [
-        "%a, %d %b %Y %H:%M:%S %z",
-        "%a, %d %b %Y %H:%M:%S GMT",
-        "%Y-%m-%dT%H:%M:%SZ",
-        "%Y-%m-%dT%H:%M:%S%z",
-        "%Y-%m-%dT%H:%M:%S.%f%z",
-    ]
-    for fmt in formats:
-        try:
-            dt = datetime.strptime(s.strip(), fmt)
-            if dt.tzinfo is None:
-                dt = dt.replace(tzinfo=timezone.utc)
-            return dt
-        except:
-            continue
-    return None
+    s = s.strip()
+    try:
+        if s[:4].isdigit():
+            dt = datetime.fromisoformat(s.replace("Z", "+00:00"))
+        else:
+            dt = parsedate_to_datetime(s)
+    except (ValueError, TypeError):
+        return None
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt
+
+_ATOM_NS    = {"atom": "http://www.w3.org/2005/Atom"}
+_ATOM_ENTRY = "{http://www.w3.org/2005/Atom}entry"
+_FEED_CHUNK = 64 * 1024
+
+def _feed_item_fields(item: ET.Element) -> dict:
+    # RSS 2.0
+    link        = item.findtext("link", "").strip()
+    title       = item.findtext("title", "").strip()
+    pub_date    = item.findtext("pubDate") or item.findtext("pubdate", "")
+    description = item.findtext("description") or ""
+
+    # Atom fallback
+    if not link:
+        link_el = item.find("atom:link", _ATOM_NS)
+        if link_el is not None:
+            link = link_el.get("href", "").strip()
+    if not pub_date:
+        pub_date = (item.findtext("atom:updated", "", _ATOM_NS) or
+                    item.findtext("atom:published", "", _ATOM_NS))
+    if not description:
+        description = item.findtext("atom:summary", "", _ATOM_NS) or ""
+
+    return {"link": link, "title": title, "pub_date": pub_date, "description": description}
+
+def parse_feed_items(text: str) -> list[dict]:
+    """
+    Extrae los campos de cada <item> (RSS) o <entry> (Atom) en streaming:
+    cada elemento se lee al cerrarse y se vacía, sin retener el árbol entero.
+    Si el feed tiene items RSS se usan esos; si no, las entradas Atom.
+    """
+    rss_items, atom_items = [], []
+    parser = ET.XMLPullParser(events=("end",))
+
+    def drain():
+        for _, elem in parser.read_events():
+            if elem.tag == "item":
+                rss_items.append(_feed_item_fields(elem))
+                elem.clear()
+            elif elem.tag == _ATOM_ENTRY:
+                atom_items.append(_feed_item_fields(elem))
+                elem.clear()
+
+    for i in range(0, len(text), _FEED_CHUNK):
+        parser.feed(text[i:i + _FEED_CHUNK])
+        drain()
+    parser.close()
+    drain()
+    return rss_items or atom_items
 
 def fetch_rss_feeds(seen: set) -> list[dict]:
     entries = []
-    cutoff  = cutoff_dt()
+    # Descarga y parseo en paralelo (cada feed es un host distinto); las
+    # escrituras en seen siguen en este hilo, en el orden de RSS_FEEDS.
+    # Un feed que no parsea no guarda su ETag: se reintenta en la próxima.
+    def get_feed(feed_url: str):
+        return safe_get_text(feed_url, parse=parse_feed_items)
 
-    for name, feed_url in RSS_FEEDS:
-        print(f"    feed: {name}")
-        text = safe_get_text(feed_url)
-        if not text:
-            continue
+    parsed = fetch_parallel(get_feed, [feed_url for _, feed_url in RSS_FEEDS])
 
-        try:
-            root = ET.fromstring(text)
-        except ET.ParseError as e:
-            print(f"    ⚠  Parse error {name}: {e}")
+    for (name, _), items in zip(RSS_FEEDS, parsed):
+        log(f"    feed: {name}")
+        if not items:
             continue
 
-        ns    = {"atom": "http://www.w3.org/2005/Atom"}
-        items = root.findall(".//item") or root.findall(".//atom:entry", ns)
-
         for item in items:
-            # RSS 2.0
-            link        = item.findtext("link", "").strip()
-            title       = item.findtext("title", "").strip()
-            pub_date    = item.findtext("pubDate") or item.findtext("pubdate", "")
-            description = item.findtext("description") or ""
-
-            # Atom fallback
-            if not link:
-                link_el = item.find("atom:link", ns)
-                if link_el is not None:
-                    link = link_el.get("href", "").strip()
-            if not pub_date:
-                pub_date = (item.findtext("atom:updated", "", ns) or
-                            item.findtext("atom:published", "", ns))
-            if not description:
-                description = item.findtext("atom:summary", "", ns) or ""
+            link        = item["link"]
+            title       = item["title"]
+            pub_date    = item["pub_date"]
+            description = item["description"]
 
             if not link or link in seen:
                 continue
 
             # Filtro fecha
             dt = parse_rss_date(pub_date)
-            if dt and dt < cutoff:
+            if dt and dt < CUTOFF:
                 continue
 
             # Filtro relevancia
             if not is_relevant(f"{title} {description}"):
                 continue
 
-            desc_clean = re.sub(r"<[^>]+>", "", description)[:250].strip()
+            desc_clean = _HTML_TAG_RE.sub("", description)[:250].strip()
 
             entries.append({
                 "title": title,
@@ -691,8 +1176,7 @@ MIN_CIVITAI_RATING    = 4.0  # sobre 5
 
 def fetch_civitai_loras(seen: set) -> list[dict]:
     entries = []
-    cutoff  = cutoff_dt()
-    print(f"    endpoint: civitai.com/api/v1/models?types=LORA")
+    log(f"    endpoint: civitai.com/api/v1/models?types=LORA")
 
     params = {
         "types":   "LORA",
@@ -715,15 +1199,12 @@ def fetch_civitai_loras(seen: set) -> list[dict]:
         if url in seen:
             continue
 
-        # Filtro fecha (usando la versión más reciente)
+        # Filtros ordenados de más barato a más caro: parse_iso y la
+        # limpieza de HTML solo se pagan para los modelos que pasan el resto
         versions = model.get("modelVersions", [])
         if not versions:
             continue
         latest = versions[0]
-        created_at = latest.get("createdAt", "")
-        dt = parse_iso(created_at)
-        if not dt or dt < cutoff:
-            continue
 
         # Filtro base model
         base_model = latest.get("baseModel", "")
@@ -737,15 +1218,19 @@ def fetch_civitai_loras(seen: set) -> list[dict]:
         if downloads < MIN_CIVITAI_DOWNLOADS and rating < MIN_CIVITAI_RATING:
             continue
 
-        name        = model.get("name", "")
-        description = (model.get("description") or "")
-        # Limpiar HTML básico de la descripción
-        description = re.sub(r"<[^>]+>", "", description)[:250].strip()
-
         # Filtro relevancia por nombre
+        name = model.get("name", "")
         if is_trivial_name(name):
             continue
 
+        # Filtro fecha (usando la versión más reciente)
+        dt = parse_iso(latest.get("createdAt", ""))
+        if not dt or dt < CUTOFF:
+            continue
+
+        # Limpiar HTML básico de la descripción
+        description = _HTML_TAG_RE.sub("", model.get("description") or "")[:250].strip()
+
         tags     = [t.get("name", "") for t in model.get("tags", [])]
         tags_str = ", ".join(tags[:6])
 
@@ -772,8 +1257,7 @@ def fetch_civitai_loras(seen: set) -> list[dict]:
 # ----------------------------
 def fetch_openmodeldb(seen: set) -> list[dict]:
     entries = []
-    cutoff  = cutoff_dt()
-    print(f"    endpoint: OpenModelDB/open-model-database commits")
+    log(f"    endpoint: OpenModelDB/open-model-database commits")
 
     # Obtener commits recientes del repo
     commits = safe_get_json(
@@ -789,20 +1273,27 @@ def fetch_openmodeldb(seen: set) -> list[dict]:
     for commit in commits:
         date_str = commit.get("commit", {}).get("committer", {}).get("date", "")
         dt = parse_iso(date_str)
-        if dt and dt >= cutoff:
+        if dt and dt >= CUTOFF:
             recent_commits.append(commit)
 
     if not recent_commits:
-        print("    → Sin commits recientes en OpenModelDB")
+        log("    → Sin commits recientes en OpenModelDB")
         return entries
 
-    # Para cada commit reciente, obtener los archivos modificados
-    for commit in recent_commits[:5]:  # máx 5 commits para no abusar de la API
-        sha = commit.get("sha", "")
-        commit_data = safe_get_json(
+    # Detalle de cada commit reciente (ficheros modificados), en paralelo
+    def commit_detail(sha: str):
+        return safe_get_json(
             f"https://api.github.com/repos/OpenModelDB/open-model-database/commits/{sha}",
             headers=github_headers(),
         )
+
+    shas = [c.get("sha", "") for c in recent_commits[:5]]  # máx 5 commits para no abusar de la API
+    details = fetch_parallel(commit_detail, shas)
+
+    # Ficheros de modelos a leer, en orden y sin repetir entre commits
+    candidates = []
+    queued = set()
+    for commit_data in details:
         if not commit_data:
             continue
 
@@ -818,41 +1309,47 @@ def fetch_openmodeldb(seen: set) -> list[dict]:
             # Extraer ID del modelo del path
             model_id = filename.replace("data/models/", "").replace(".json", "")
             url = f"https://openmodeldb.info/models/{model_id}"
-            if url in seen:
+            if url in seen or url in queued:
                 continue
+            queued.add(url)
+            candidates.append((model_id, url, filename))
+
+    # Intentar leer el JSON de cada modelo para obtener detalles (raw.githubusercontent
+    # no tiene el rate limit de api.github.com: todas las lecturas van en paralelo)
+    def model_detail(candidate: tuple):
+        raw_url = f"https://raw.githubusercontent.com/OpenModelDB/open-model-database/main/{candidate[2]}"
+        return safe_get_json(raw_url)
+
+    model_jsons = fetch_parallel(model_detail, candidates)
+
+    for (model_id, url, _), model_json in zip(candidates, model_jsons):
+        if model_json:
+            name        = model_json.get("name", model_id)
+            description = (model_json.get("description") or "")[:250].strip()
+            tags        = model_json.get("tags", [])
+            scale       = model_json.get("scale", "")
+            arch        = model_json.get("architecture", "")
+            tags_str    = ", ".join(tags[:6]) if tags else ""
+            scale_str   = f"{scale}x" if scale else ""
+        else:
+            name        = model_id
+            description = ""
+            tags_str    = ""
+            scale_str   = ""
+            arch        = ""
 
-            # Intentar leer el JSON del modelo para obtener detalles
-            raw_url = f"https://raw.githubusercontent.com/OpenModelDB/open-model-database/main/{filename}"
-            model_json = safe_get_json(raw_url)
-
-            if model_json:
-                name        = model_json.get("name", model_id)
-                description = (model_json.get("description") or "")[:250].strip()
-                tags        = model_json.get("tags", [])
-                scale       = model_json.get("scale", "")
-                arch        = model_json.get("architecture", "")
-                tags_str    = ", ".join(tags[:6]) if tags else ""
-                scale_str   = f"{scale}x" if scale else ""
-            else:
-                name        = model_id
-                description = ""
-                tags_str    = ""
-                scale_str   = ""
-                arch        = ""
-
-            entries.append({
-                "title":    f"{name} ({scale_str} {arch})".strip(" ()"),
-                "url":      url,
-                "que_es":   f"Modelo de upscaling en OpenModelDB. Arquitectura: {arch or 'N/A'}. Escala: {scale_str or 'N/A'}.",
-                "para_que": description or f"Modelo de upscaling/restauración. Tags: {tags_str}.",
-                "requisitos": "Descargar desde OpenModelDB. Compatible con chaiNNer, ComfyUI upscaler.",
-                "cambios":  f"Añadido recientemente. Tags: {tags_str}" if tags_str else "Modelo nuevo en OpenModelDB.",
-                "_source": "OpenModelDB",
-                "_ecosystem_hint": "ComfyUI",
-                "_traction": 0,
-            })
-            seen.add(url)
-            time.sleep(0.3)
+        entries.append({
+            "title":    f"{name} ({scale_str} {arch})".strip(" ()"),
+            "url":      url,
+            "que_es":   f"Modelo de upscaling en OpenModelDB. Arquitectura: {arch or 'N/A'}. Escala: {scale_str or 'N/A'}.",
+            "para_que": description or f"Modelo de upscaling/restauración. Tags: {tags_str}.",
+            "requisitos": "Descargar desde OpenModelDB. Compatible con chaiNNer, ComfyUI upscaler.",
+            "cambios":  f"Añadido recientemente. Tags: {tags_str}" if tags_str else "Modelo nuevo en OpenModelDB.",
+            "_source": "OpenModelDB",
+            "_ecosystem_hint": "ComfyUI",
+            "_traction": 0,
+        })
+        seen.add(url)
 
     return entries
 
@@ -861,6 +1358,17 @@ def fetch_openmodeldb(seen: set) -> list[dict]:
 # ----------------------------
 AWESOME_COMFYUI_URL = "https://raw.githubusercontent.com/ComfyUI-Workflow/awesome-comfyui/main/README.md"
 
+# Entradas de lista markdown del README:
+# * [**Nombre**](url): descripcion
+# * [**Nombre**](url) (stars+NNN): descripcion
+_AWESOME_ENTRY_RE = re.compile(
+    r'^\*\s+\[[\*_]*([^\]]+?)[\*_]*\]\((https://github\.com/[^\)]+)\)'
+    r'(?:\s+\(â­\+(\d+)\))?'
+    r'(?::\s+(.+))?$'
+)
+# Emojis (planos astrales + símbolos/dingbats) y espacios en los nombres
+_NAME_EMOJI_RE = re.compile(r'[\U00010000-\U0010ffff\u2600-\u27BF\s]+')
+
 def fetch_awesome_comfyui(seen: set) -> list[dict]:
     """
     Parsea el README de awesome-comfyui y extrae:
@@ -871,7 +1379,7 @@ def fetch_awesome_comfyui(seen: set) -> list[dict]:
     Se protege contra duplicados via seen (URL del repo GitHub de cada node).
     """
     entries = []
-    print(f"    endpoint: {AWESOME_COMFYUI_URL}")
+    log(f"    endpoint: {AWESOME_COMFYUI_URL}")
 
     text = safe_get_text(AWESOME_COMFYUI_URL)
     if not text:
@@ -887,20 +1395,11 @@ def fetch_awesome_comfyui(seen: set) -> list[dict]:
         elif current_section is not None:
             sections[current_section].append(line)
 
-    # Regex para entradas de lista markdown:
-    # * [**Nombre**](url): descripcion
-    # * [**Nombre**](url) (stars+NNN): descripcion
-    ENTRY_RE = re.compile(
-        r'^\*\s+\[[\*_]*([^\]]+?)[\*_]*\]\((https://github\.com/[^\)]+)\)'
-        r'(?:\s+\(â­\+(\d+)\))?'
-        r'(?::\s+(.+))?$'
-    )
-
     def parse_section(section_name: str, source_tag: str, traction_base: int) -> list[dict]:
         result = []
         lines = sections.get(section_name, [])
         for line in lines:
-            m = ENTRY_RE.match(line.strip())
+            m = _AWESOME_ENTRY_RE.match(line.strip())
             if not m:
                 continue
             name        = m.group(1).strip()
@@ -908,8 +1407,12 @@ def fetch_awesome_comfyui(seen: set) -> list[dict]:
             stars_delta = int(m.group(3)) if m.group(3) else 0
             description = (m.group(4) or "").strip()
 
-            # Limpiar emojis del nombre
-            name = re.sub(r'[\U00010000-\U0010ffff\u2600-\u27BF\s]+', ' ', name).strip()
+            # Limpiar emojis del nombre. Casi todos son ASCII puro: basta con
+            # colapsar espacios (mismo resultado que la regex, sin pasar por ella)
+            if name.isascii():
+                name = " ".join(name.split())
+            else:
+                name = _NAME_EMOJI_RE.sub(' ', unicodedata.normalize("NFKC", name)).strip()
 
             if not name or url in seen:
                 continue
@@ -937,8 +1440,8 @@ def fetch_awesome_comfyui(seen: set) -> list[dict]:
     new_entries      = parse_section("New Workflows",      "New Workflows", traction_base=0)
     trending_entries = parse_section("Trending Workflows", "Trending",      traction_base=50)
 
-    print(f"    -> {len(new_entries)} nodes nuevos en el Manager")
-    print(f"    -> {len(trending_entries)} nodes trending por stars")
+    log(f"    -> {len(new_entries)} nodes nuevos en el Manager")
+    log(f"    -> {len(trending_entries)} nodes trending por stars")
     entries.extend(new_entries)
     entries.extend(trending_entries)
     return entries
@@ -948,101 +1451,117 @@ def fetch_awesome_comfyui(seen: set) -> list[dict]:
 # ----------------------------
 # Main
 # ----------------------------
+SOURCES = [
+    ("GitHub — repos nuevos",                       fetch_github_repos),
+    ("GitHub — releases/commits de repos clave",    fetch_github_releases),
+    ("HuggingFace — modelos nuevos",                fetch_huggingface_models),
+    ("RSS — blogs de vendors",                      fetch_rss_feeds),
+    ("Civitai — LoRAs nuevas (Flux · SDXL · Wan)",  fetch_civitai_loras),
+    ("OpenModelDB — modelos de upscaling nuevos",   fetch_openmodeldb),
+    ("Awesome ComfyUI — nodes nuevos y trending",   fetch_awesome_comfyui),
+]
+
+def run_source(fetch, seen: set) -> tuple:
+    """
+    Ejecuta una fuente en su hilo, capturando sus mensajes de progreso.
+    Un fallo inesperado se queda en su fuente: devuelve ok=False y nada que
+    fusionar, y el resto de fuentes sigue adelante.
+    """
+    _out.buf = []
+    try:
+        return fetch(seen), seen, _out.buf, True
+    except Exception as e:
+        log(f"  ⚠  La fuente ha fallado: {e}")
+        return [], set(), _out.buf, False
+    finally:
+        _out.buf = None
+
 def main():
-    print(f"\n{'='*55}")
-    print(f"  GenAI Radar — Monitor de fuentes v4")
-    print(f"  Ventana: últimos {LOOKBACK_DAYS} días")
-    print(f"{'='*55}\n")
+    # Salida por logging (stdout, sin prefijos); el detalle va a DEBUG
+    level = LOG_LEVEL if isinstance(logging.getLevelName(LOG_LEVEL), int) else "INFO"
+    # El nivel se aplica solo a nuestro logger: en DEBUG, urllib3/requests
+    # siguen en INFO y no inundan la salida con el pool de conexiones
+    logging.basicConfig(level=logging.INFO, format="%(message)s", stream=sys.stdout)
+    logger.setLevel(level)
+
+    logger.info(f"\n{'='*55}")
+    logger.info(f"  GenAI Radar — Monitor de fuentes v4")
+    logger.info(f"  Ventana: últimos {LOOKBACK_DAYS} días")
+    logger.info(f"{'='*55}\n")
 
     seen = load_seen()
+    load_etags()
     all_entries = []
 
-    print("📡 GitHub — repos nuevos")
-    gh_repos = fetch_github_repos(seen)
-    print(f"   → {len(gh_repos)} entradas")
-    all_entries.extend(gh_repos)
-
-    print("\n📡 GitHub — releases/commits de repos clave")
-    gh_releases = fetch_github_releases(seen)
-    print(f"   → {len(gh_releases)} entradas")
-    all_entries.extend(gh_releases)
-
-    print("\n📡 HuggingFace — modelos nuevos")
-    hf_models = fetch_huggingface_models(seen)
-    print(f"   → {len(hf_models)} entradas")
-    all_entries.extend(hf_models)
-
-    print("\n📡 RSS — blogs de vendors")
-    rss_entries = fetch_rss_feeds(seen)
-    print(f"   → {len(rss_entries)} entradas")
-    all_entries.extend(rss_entries)
-
-    print("\n📡 Civitai — LoRAs nuevas (Flux · SDXL · Wan)")
-    civitai_entries = fetch_civitai_loras(seen)
-    print(f"   → {len(civitai_entries)} entradas")
-    all_entries.extend(civitai_entries)
-
-    print("\n📡 OpenModelDB — modelos de upscaling nuevos")
-    omdb_entries = fetch_openmodeldb(seen)
-    print(f"   → {len(omdb_entries)} entradas")
-    all_entries.extend(omdb_entries)
-
-    print("\n📡 Awesome ComfyUI — nodes nuevos y trending")
-    awesome_entries = fetch_awesome_comfyui(seen)
-    print(f"   → {len(awesome_entries)} entradas")
-    all_entries.extend(awesome_entries)
+    # Las fuentes son independientes: se lanzan a la vez (el rate limiter por
+    # host es compartido, así que GitHub sigue respetando su cuota).
+    # Cada una trabaja sobre su propia copia de seen; las URLs que dos fuentes
+    # encuentren a la vez se resuelven después en la deduplicación por URL,
+    # que conserva la de la fuente anterior (igual que en secuencial).
+    all_ok = True
+    with ThreadPoolExecutor(max_workers=len(SOURCES)) as pool:
+        futures = [pool.submit(run_source, fetch, set(seen)) for _, fetch in SOURCES]
+        for i, ((label, _), future) in enumerate(zip(SOURCES, futures)):
+            entries, source_seen, lines, ok = future.result()
+            logger.info(f"\n📡 {label}" if i else f"📡 {label}")
+            for line in lines:
+                logger.info(line)
+            logger.info(f"   → {len(entries)} entradas")
+            all_entries.extend(entries)
+            seen |= source_seen
+            all_ok &= ok
 
     save_seen(seen)
+    # Si alguna fuente falló, sus validadores nuevos apuntarían a entradas
+    # que no llegan al digest: se conserva el fichero de la ejecución anterior
+    if all_ok:
+        save_etags()
 
     if not all_entries:
-        print("\n✅ No hay novedades nuevas desde la última ejecución.")
-        print("   Tip: borra state/monitor_seen.json para forzar re-escaneo.\n")
+        logger.info("\n✅ No hay novedades nuevas desde la última ejecución.")
+        logger.info("   Tip: borra state/monitor_seen.txt para forzar re-escaneo.\n")
         return
 
-    # Deduplicar por URL
-    seen_urls = set()
-    url_deduped = []
-    for e in all_entries:
-        if e["url"] not in seen_urls:
-            seen_urls.add(e["url"])
-            url_deduped.append(e)
-
-    # Anti-duplicados cross-fuente (título normalizado)
+    # Un solo pase: deduplicar por URL (gana la primera aparición, en orden
+    # de fuentes), descartar duplicados cross-fuente por título normalizado
+    # y puntuar lo que sobrevive. La URL se marca antes del chequeo de título
+    # para que una repetición posterior caiga por URL, como en dos pases.
     _NORM_TITLES_SEEN.clear()
+    seen_urls = set()
     unique = []
     cross_skipped = 0
-    for e in url_deduped:
-        if is_cross_duplicate(e["title"]):
+    for e in all_entries:
+        url = e["url"]
+        if url in seen_urls:
+            continue
+        seen_urls.add(url)
+        title = e["title"]
+        if is_cross_duplicate(title):
             cross_skipped += 1
-            print(f"  Cross-dup saltado: {e['title'][:70]}")
-        else:
-            unique.append(e)
+            logger.debug("  Cross-dup saltado: %s", title[:70])
+            continue
+        e["_score"] = score_entry(e)
+        unique.append(e)
 
     if cross_skipped:
-        print(f"   → {cross_skipped} entradas eliminadas por duplicado cross-fuente")
-
-    # Scoring y ordenación por relevancia
-    for e in unique:
-        e["_score"] = score_entry(e)
-    unique.sort(key=lambda e: e["_score"], reverse=True)
-
-    # Escribir digest
-    lines = [
-        format_entry(i+1, e["title"], e["url"], e["que_es"],
-                     e["para_que"], e["requisitos"], e["cambios"],
-                     score=e["_score"])
-        for i, e in enumerate(unique)
-    ]
-    DIGEST_FILE.write_text("\n".join(lines).strip(), encoding="utf-8")
-
-    print(f"\n{'='*55}")
-    print(f"  ✅ Digest generado: {len(unique)} entradas")
-    print(f"  → {DIGEST_FILE}")
-    print(f"{'='*55}")
-    print("\nPróximos pasos:")
-    print("  1. Arrastra digest_raw.txt a Claude para clasificar")
-    print("  2. Descarga el digest.txt que te entregue Claude")
-    print("  3. Ejecuta importar_digest.bat\n")
+        logger.info(f"   → {cross_skipped} entradas eliminadas por duplicado cross-fuente")
+
+    # Ordenación por relevancia
+    unique.sort(key=itemgetter("_score"), reverse=True)
+
+    # Escribir digest: entrada a entrada sobre el fichero abierto, sin montar
+    # el texto completo en memoria
+    with open(DIGEST_FILE, "w", encoding="utf-8", buffering=1 << 16) as f:
+        f.writelines(iter_digest_chunks(unique))
+
+    logger.info(f"\n{'='*55}")
+    logger.info(f"  ✅ Digest generado: {len(unique)} entradas")
+    logger.info(f"  → {DIGEST_FILE}")
+    logger.info(f"{'='*55}")
+    logger.info("\nPróximos pasos:")
+    logger.info("  1. Arrastra digest_raw.txt a Claude para clasificar")
+    logger.info("  2. Descarga el digest.txt que te entregue Claude")
+    logger.info("  3. Ejecuta importar_digest.bat\n")
 
 
 if __name__ == "__main__":